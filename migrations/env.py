@@ -5,14 +5,14 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
-# Add the project root directory to Python path for consistent imports
-# This allows imports like 'from src.database import Base'
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from src.database import Base  # Corrected import for Base
-# Import your models here to ensure they are registered with Base.metadata
-import src.auth.models  # Assuming models are in src/auth/models.py
-import src.tasks.models # Assuming models are in src/tasks/models.py
+# Import application modules from src/, the same root the app uses
+# (e.g. 'from database import Base')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import Base
+# Import the ORM tables so they are registered with Base.metadata
+import auth.schema
+import tasks.schema
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,39 @@
+"""add tasks created_at/id index
+
+Revision ID: 3f8a1c2d9e47
+Revises: a0499410f5ed
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c2d9e47'
+down_revision: Union[str, None] = 'a0499410f5ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Supports keyset pagination on GET /tasks/ (ORDER BY created_at, id).
+    # Built CONCURRENTLY so writes to tasks are not blocked meanwhile; that
+    # cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_created_at_id', 'tasks', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_created_at_id', table_name='tasks',
+            postgresql_concurrently=True
+        )
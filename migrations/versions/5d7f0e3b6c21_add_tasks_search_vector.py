@@ -0,0 +1,56 @@
+"""add tasks search vector
+
+Revision ID: 5d7f0e3b6c21
+Revises: 8c2e4b7d1a90
+Create Date: 2026-10-17 11:58:44.127035
+
+Adding a STORED generated column rewrites the whole tasks table while
+holding an ACCESS EXCLUSIVE lock, so reads and writes to tasks wait for it;
+on a large table run this upgrade in a maintenance window. lock_timeout
+makes it fail fast instead of queueing behind long transactions and
+stalling every request behind it. The GIN index is then built
+CONCURRENTLY, after the rewrite has committed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7f0e3b6c21'
+down_revision: Union[str, None] = '8c2e4b7d1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('english', coalesce(title, '') || ' ' || "
+            "coalesce(description, ''))",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector', 'tasks', ['search_vector'],
+            unique=False, postgresql_using='gin',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_search_vector', table_name='tasks',
+            postgresql_concurrently=True
+        )
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,53 @@
+"""add tasks filter indexes
+
+Revision ID: 8c2e4b7d1a90
+Revises: 3f8a1c2d9e47
+Create Date: 2026-10-17 10:41:08.553904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4b7d1a90'
+down_revision: Union[str, None] = '3f8a1c2d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Supports GET /tasks/ filters (completed, created/updated ranges) and
+    # keyset pagination for every order_by value. Built CONCURRENTLY (outside
+    # a transaction) so writes to tasks are not blocked meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tasks_completed_created_at_id', 'tasks',
+            ['completed', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tasks_completed_updated_at_id', 'tasks',
+            ['completed', 'updated_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_tasks_completed_updated_at_id',
+            'ix_tasks_completed_created_at_id',
+            'ix_tasks_updated_at_id',
+        ):
+            op.drop_index(
+                name, table_name='tasks', postgresql_concurrently=True
+            )
@@ -0,0 +1,51 @@
+"""add tasks archive
+
+Revision ID: b7e94f1c3d58
+Revises: 5d7f0e3b6c21
+Create Date: 2026-10-17 14:22:57.860315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e94f1c3d58'
+down_revision: Union[str, None] = '5d7f0e3b6c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Monthly partitions are created on demand by the
+    # archive_completed_tasks Celery task
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'),
+              nullable=False),
+    sa.PrimaryKeyConstraint('id', 'archived_at'),
+    postgresql_partition_by='RANGE (archived_at)'
+    )
+    op.create_index(
+        'ix_tasks_archive_created_at_id', 'tasks_archive',
+        ['created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_tasks_archive_updated_at_id', 'tasks_archive',
+        ['updated_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_archive_updated_at_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_created_at_id', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,68 @@
+"""add task list version
+
+Revision ID: e1f3a5c7b9d2
+Revises: b7e94f1c3d58
+Create Date: 2026-10-17 16:05:12.318440
+
+A single-row counter bumped by statement-level triggers on tasks, in the
+same transaction as every insert, update and delete (including the
+archive job's raw SQL). GET /tasks/ builds its ETag from it, so the list
+version can never miss a committed write.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a5c7b9d2'
+down_revision: Union[str, None] = 'b7e94f1c3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Transition tables are only allowed on single-event triggers, hence one
+# trigger per event; statements that touch no rows leave the version alone
+TRIGGERS = (
+    ('tasks_insert_list_version', 'INSERT', 'NEW'),
+    ('tasks_update_list_version', 'UPDATE', 'NEW'),
+    ('tasks_delete_list_version', 'DELETE', 'OLD'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_list_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0',
+              nullable=False),
+    sa.CheckConstraint('id = 1', name='task_list_version_single_row'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO task_list_version (id, version) VALUES (1, 0)")
+    op.execute("""
+        CREATE FUNCTION bump_task_list_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM changed_tasks) THEN
+                UPDATE task_list_version SET version = version + 1
+                WHERE id = 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for name, event, transition in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON tasks "
+            f"REFERENCING {transition} TABLE AS changed_tasks "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_task_list_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON tasks")
+    op.execute("DROP FUNCTION bump_task_list_version()")
+    op.drop_table('task_list_version')
@@ -0,0 +1,83 @@
+"""spread task list version over slots
+
+Revision ID: f4c8d2a6e0b3
+Revises: e1f3a5c7b9d2
+Create Date: 2026-10-17 18:42:06.904115
+
+Bumping one counter row made every transaction that wrote to tasks hold
+that row's lock until commit, so concurrent task writers ran one at a
+time. The version is now spread over SLOTS rows: each write bumps the
+first slot no other transaction holds (FOR UPDATE SKIP LOCKED), and the
+list version is their sum. Writers only wait on each other when more than
+SLOTS of them are in flight at once. The sum still grows with every
+committed write and never with a rolled-back one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8d2a6e0b3'
+down_revision: Union[str, None] = 'e1f3a5c7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SLOTS = 32
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint(
+        'task_list_version_single_row', 'task_list_version', type_='check'
+    )
+    op.execute(
+        "INSERT INTO task_list_version (id, version) "
+        f"SELECT generate_series(2, {SLOTS}), 0"
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_task_list_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            slot integer;
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM changed_tasks) THEN
+                RETURN NULL;
+            END IF;
+            -- Rows this transaction already holds are not skipped, so a
+            -- multi-statement transaction keeps reusing its own slot
+            SELECT id INTO slot FROM task_list_version
+            ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED;
+            IF slot IS NULL THEN
+                slot := 1 + floor(random() * {SLOTS})::integer;
+            END IF;
+            UPDATE task_list_version SET version = version + 1
+            WHERE id = slot;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_task_list_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM changed_tasks) THEN
+                UPDATE task_list_version SET version = version + 1
+                WHERE id = 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(
+        "UPDATE task_list_version SET version = "
+        "(SELECT sum(version) FROM task_list_version) WHERE id = 1"
+    )
+    op.execute("DELETE FROM task_list_version WHERE id <> 1")
+    op.create_check_constraint(
+        'task_list_version_single_row', 'task_list_version', 'id = 1'
+    )
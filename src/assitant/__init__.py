@@ -1,23 +1,103 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+from cache import LRUTTLCache
+from config import settings
 
 from .base import BaseAssistant, AIMessage, AIConversation
-from .openai import OpenAIAssistant
+from .openai import OPENAI_API_KEY, OpenAIAssistant
+
+ASSISTANT_TYPE_OPENAI = "openai"
+DEFAULT_OPENAI_MODEL = "gpt-3.5-turbo"
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """HTTP settings of a pooled provider client; part of the cache key."""
+    max_connections: int = settings.openai_max_connections
+    max_keepalive_connections: int = settings.openai_max_keepalive_connections
+    keepalive_expiry: float = settings.openai_keepalive_expiry_seconds
+    http2: bool = settings.openai_http2
+    timeout: float = settings.openai_timeout_seconds
+
+
+class AssistantRegistry:
+    """
+    Process-wide cache of assistants, one per (provider, model, config).
+
+    Assistants with the same provider and config share one AsyncOpenAI
+    client, so TLS sessions and keep-alive connections are reused across
+    requests and models. Call close() on shutdown.
+
+    model_name comes from the client, so assistants are kept in a bounded
+    LRU; an evicted one is simply rebuilt on top of the shared client.
+    """
+    def __init__(
+        self, max_assistants: int = settings.openai_assistant_cache_size
+    ):
+        self._clients: Dict[Tuple[str, ClientConfig], AsyncOpenAI] = {}
+        self._assistants = LRUTTLCache(
+            maxsize=max_assistants, ttl=float("inf")
+        )
+
+    def get(
+        self,
+        assistant_type: str = ASSISTANT_TYPE_OPENAI,
+        model_name: Optional[str] = None,
+        config: Optional[ClientConfig] = None
+    ) -> BaseAssistant:
+        # Only OpenAI is supported; other types fall back to it
+        provider = ASSISTANT_TYPE_OPENAI
+        model_name = model_name or DEFAULT_OPENAI_MODEL
+        config = config or ClientConfig()
+
+        key = (provider, model_name, config)
+        assistant = self._assistants.get(key)
+        if assistant is None:
+            assistant = OpenAIAssistant(
+                model_name=model_name, client=self._client(provider, config)
+            )
+            self._assistants.set(key, assistant)
+        return assistant
+
+    def _client(self, provider: str, config: ClientConfig) -> AsyncOpenAI:
+        client = self._clients.get((provider, config))
+        if client is None:
+            http_client = httpx.AsyncClient(
+                http2=config.http2,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry
+                ),
+                timeout=config.timeout
+            )
+            client = AsyncOpenAI(
+                api_key=OPENAI_API_KEY, http_client=http_client
+            )
+            self._clients[(provider, config)] = client
+        return client
+
+    async def close(self) -> None:
+        """Close every pooled client and forget the cached assistants."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._assistants.clear()
+        for client in clients:
+            await client.close()
+
+
+assistant_registry = AssistantRegistry()
 
 
 def get_assistant(
     assistant_type: str, model_name: str | None = None
 ) -> BaseAssistant:
-    if assistant_type == "openai":
-        # Here you could add logic to select different OpenAI models 
-        # or configurations based on model_name or other parameters
-        # For now, it defaults to the standard OpenAIAssistant
-        return OpenAIAssistant(model_name=model_name) 
-    else:
-        # Optionally, raise an error for unsupported types or default to OpenAI
-        # For this refinement, we assume only 'openai' is valid and was intended.
-        # If other types were accidentally passed, this would be a good place to log/error.
-        # However, the request implies 'openai' is the only intended type now.
-        return OpenAIAssistant(model_name=model_name) 
+    """Return the shared assistant for this type and model."""
+    return assistant_registry.get(assistant_type, model_name)
 
 
 __all__ = [
@@ -25,5 +105,9 @@ __all__ = [
     "AIMessage",
     "AIConversation",
     "OpenAIAssistant",
+    "ASSISTANT_TYPE_OPENAI",
+    "AssistantRegistry",
+    "ClientConfig",
+    "assistant_registry",
     "get_assistant",
-]
\ No newline at end of file
+]
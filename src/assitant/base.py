@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 class BaseAssistant(ABC):
     """Base class for AI assistants."""
@@ -18,6 +18,25 @@ class BaseAssistant(ABC):
         """Generate a response in a chat context."""
         pass
 
+    @abstractmethod
+    async def cached_chat_response(
+        self,
+        messages: List[Dict[str, str]],
+        cache: Optional[bool] = None,
+        **kwargs
+    ) -> Tuple[str, bool]:
+        """Generate a chat response, returning (response, cache_hit)."""
+        pass
+
+    @abstractmethod
+    def stream_chat_response(
+        self,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Yield the response in a chat context as text deltas."""
+        pass
+
     @abstractmethod
     async def analyze_image(self, image_data: bytes, prompt: str) -> str:
         """Analyze an image and generate a response based on the prompt."""
@@ -28,6 +47,13 @@ class BaseAssistant(ABC):
         """Generate embeddings for the given text."""
         pass
 
+    @abstractmethod
+    async def generate_embeddings_batch(
+        self, texts: List[str]
+    ) -> List[List[float]]:
+        """Generate embeddings for many texts at once, in input order."""
+        pass
+
 class AIMessage:
     """Represents a message in an AI conversation."""
     def __init__(
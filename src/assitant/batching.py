@@ -0,0 +1,73 @@
+"""
+Micro-batching of concurrent embedding requests.
+
+Single-text calls arriving within a few milliseconds of each other are
+collected and sent as one embeddings request (one batch per model); each
+caller gets its own vector back.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+BatchFn = Callable[[List[str], str], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce `embed()` calls into batches of up to `max_batch` texts,
+    waiting at most `max_wait` seconds after the first one arrives.
+    """
+    def __init__(self, batch_fn: BatchFn, max_batch: int, max_wait: float):
+        self._batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # model -> texts and futures waiting for the next flush
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # Strong references to in-flight sends so they are not collected
+        self._sends: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str, model: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(model, [])
+        pending.append((text, future))
+
+        if len(pending) >= self.max_batch:
+            self._flush(model)
+        elif len(pending) == 1:
+            self._timers[model] = loop.call_later(
+                self.max_wait, self._flush, model
+            )
+        return await future
+
+    def _flush(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model, None)
+        if batch:
+            task = asyncio.get_running_loop().create_task(
+                self._send(model, batch)
+            )
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(
+        self, model: str, batch: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        try:
+            embeddings = await self._batch_fn([text for text, _ in batch], model)
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"expected {len(batch)} embeddings, got {len(embeddings)}"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            # A cancelled caller does not affect the rest of the batch
+            if not future.done():
+                future.set_result(embedding)
@@ -0,0 +1,54 @@
+"""
+Per-worker chat latency histograms, rendered on /metrics.
+"""
+import bisect
+from typing import Dict, List, Sequence
+
+# Seconds; chosen around typical time-to-first-token and full-reply times
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class LatencyHistogram:
+    """Prometheus-style cumulative histogram of observed latencies."""
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+
+
+def get_histogram(name: str) -> LatencyHistogram:
+    """Get (or register) the named histogram."""
+    if name not in _histograms:
+        _histograms[name] = LatencyHistogram(name)
+    return _histograms[name]
+
+
+def render_chat_metrics() -> str:
+    """Render all chat histograms in the Prometheus text format."""
+    lines = []
+    for histogram in _histograms.values():
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n" if lines else ""
@@ -1,7 +1,12 @@
 from openai import AsyncOpenAI # Use AsyncOpenAI for FastAPI
-from typing import List, Dict, Any
-from src.assitant.base import BaseAssistant, AIMessage
-from src.config import settings # Assuming API key might be in settings
+import json
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from assitant.base import BaseAssistant, AIMessage
+from assitant.batching import EmbeddingBatcher
+from assitant.response_cache import (chat_cache_key, get_cached_response,
+                                         should_cache, store_response)
+from assitant.semantic_cache import semantic_cache
+from config import settings # Assuming API key might be in settings
 import os
 
 # Configure the OpenAI API key
@@ -14,21 +19,31 @@ if not OPENAI_API_KEY:
 class OpenAIAssistant(BaseAssistant):
     """AI assistant powered by OpenAI's GPT models."""
 
-    def __init__(self, model_name: str = "gpt-3.5-turbo"):
+    def __init__(
+        self,
+        model_name: str = "gpt-3.5-turbo",
+        client: Optional[AsyncOpenAI] = None
+    ):
         if not OPENAI_API_KEY:
             raise EnvironmentError("OPENAI_API_KEY is not set. Cannot initialize OpenAIAssistant.")
         self.model_name = model_name
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        # Pass a shared client (see assitant.AssistantRegistry) to reuse its
+        # connection pool; otherwise this assistant gets a private one
+        self.client = client or AsyncOpenAI(api_key=OPENAI_API_KEY)
+        # Concurrent generate_embeddings calls share one API request
+        self._embedding_batcher = EmbeddingBatcher(
+            self.generate_embeddings_batch,
+            max_batch=settings.embedding_batch_max_size,
+            max_wait=settings.embedding_batch_max_wait_ms / 1000
+        )
 
     async def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response for the given prompt (using chat completions)."""
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                **kwargs
+            response, _ = await self.cached_chat_response(
+                [{"role": "user", "content": prompt}], **kwargs
             )
-            return response.choices[0].message.content.strip()
+            return response
         except Exception as e:
             print(f"Error generating OpenAI response: {e}")
             return f"Error: Could not get response from OpenAI. {e}"
@@ -40,16 +55,75 @@ class OpenAIAssistant(BaseAssistant):
     ) -> str:
         """Generate a response in a chat context."""
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                **kwargs
-            )
-            return response.choices[0].message.content.strip()
+            response, _ = await self.cached_chat_response(messages, **kwargs)
+            return response
         except Exception as e:
             print(f"Error generating OpenAI chat response: {e}")
             return f"Error: Could not get chat response from OpenAI. {e}"
 
+    async def cached_chat_response(
+        self,
+        messages: List[Dict[str, str]],
+        cache: Optional[bool] = None,
+        **kwargs
+    ) -> Tuple[str, bool]:
+        """
+        Chat completion through the exact-match Redis cache, then the
+        semantic cache. Caches temperature-0 requests by default; `cache`
+        forces it on or off. Returns (response, cache_hit) and raises on
+        OpenAI errors.
+        """
+        key = None
+        embedding: List[float] = []
+        if should_cache(kwargs, cache):
+            key = chat_cache_key(self.model_name, messages, kwargs)
+            cached = await get_cached_response(key)
+            if cached is not None:
+                return cached, True
+
+            if settings.semantic_cache_enabled:
+                scope = json.dumps(
+                    {"model": self.model_name, "params": kwargs}, sort_keys=True
+                )
+                embedding = await self.generate_embeddings("\n".join(
+                    f"{m['role']}: {m['content']}" for m in messages
+                ))
+                if embedding:
+                    cached = semantic_cache.lookup(scope, embedding)
+                    if cached is not None:
+                        return cached, True
+
+        response = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            **kwargs
+        )
+        content = response.choices[0].message.content.strip()
+        if key is not None:
+            await store_response(key, content)
+        if embedding:
+            semantic_cache.add(scope, embedding, content)
+        return content, False
+
+    async def stream_chat_response(
+        self,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response as text deltas while OpenAI generates it.
+        Errors are raised to the caller, which may already have sent output.
+        """
+        stream = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            stream=True,
+            **kwargs
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     async def analyze_image(self, image_data: bytes, prompt: str) -> str:
         """Analyze an image (using GPT-4 Vision if available and configured)."""
         # This requires a model like gpt-4-vision-preview and specific formatting
@@ -83,17 +157,30 @@ class OpenAIAssistant(BaseAssistant):
         return "OpenAI image analysis placeholder response."
 
     async def generate_embeddings(self, text: str, model: str = "text-embedding-ada-002") -> List[float]:
-        """Generate embeddings for the given text."""
+        """
+        Generate embeddings for the given text.
+        Calls made within EMBEDDING_BATCH_MAX_WAIT_MS of each other are sent
+        to OpenAI as a single batch request.
+        """
         try:
-            response = await self.client.embeddings.create(
-                input=text,
-                model=model
-            )
-            return response.data[0].embedding
+            return await self._embedding_batcher.embed(text, model)
         except Exception as e:
             print(f"Error generating OpenAI embeddings: {e}")
             return []
 
+    async def generate_embeddings_batch(
+        self, texts: List[str], model: str = "text-embedding-ada-002"
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in one request, in input order.
+        Raises on OpenAI errors.
+        """
+        response = await self.client.embeddings.create(
+            input=texts,
+            model=model
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
 # Example Usage (for testing):
 async def main():
     if not OPENAI_API_KEY:
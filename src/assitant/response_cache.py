@@ -0,0 +1,71 @@
+"""
+Exact-match Redis cache for chat completions.
+
+Entries are keyed by a hash of (model, messages, sampling params), stored
+zlib-compressed with a TTL, and only used for deterministic requests
+(temperature 0) unless the caller opts in explicitly.
+"""
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from cache import get_cache_stats, get_redis
+from config import settings
+
+CHAT_CACHE_PREFIX = "chat_cache:"
+
+chat_cache_stats = get_cache_stats("chat")
+
+
+def should_cache(params: Dict[str, Any], opt_in: Optional[bool] = None) -> bool:
+    """Cache when explicitly asked to, or by default for temperature 0."""
+    if opt_in is not None:
+        return opt_in
+    return params.get("temperature") == 0
+
+
+def chat_cache_key(
+    model: str, messages: List[Dict[str, str]], params: Dict[str, Any]
+) -> str:
+    """Stable key for a completion request; key order does not matter."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return CHAT_CACHE_PREFIX + hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_cached_response(key: str) -> Optional[str]:
+    """
+    Cached completion text, or None on a miss, a Redis error or an entry
+    that does not decompress.
+    """
+    try:
+        data = await get_redis().get(key)
+    except RedisError as e:
+        print(f"Chat cache read failed: {e}")
+        data = None
+    if data is not None:
+        try:
+            text = zlib.decompress(data).decode()
+        except (zlib.error, UnicodeDecodeError) as e:
+            # A corrupt or foreign value is a miss, not a failed request
+            print(f"Chat cache entry {key} unreadable: {e}")
+        else:
+            chat_cache_stats.hit()
+            return text
+    chat_cache_stats.miss()
+    return None
+
+
+async def store_response(key: str, text: str) -> None:
+    """Store a completion for CHAT_CACHE_TTL_SECONDS."""
+    try:
+        await get_redis().set(
+            key, zlib.compress(text.encode()), ex=settings.chat_cache_ttl_seconds
+        )
+    except RedisError as e:
+        print(f"Chat cache write failed: {e}")
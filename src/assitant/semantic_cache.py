@@ -0,0 +1,277 @@
+"""
+Semantic response cache: reuse answers for paraphrased prompts.
+
+Prompt embeddings are kept L2-normalised in float32 NumPy matrices, so a
+lookup is one matrix-vector product (cosine similarity against every entry)
+followed by an argmax. Entries are scoped by model and sampling params and
+evicted least-recently-used.
+
+The index is saved to an .npy file plus a JSON manifest every
+SEMANTIC_CACHE_SAVE_EVERY inserts and on shutdown. On startup the saved
+vectors stay a read-only memory map shared through the page cache by every
+worker; entries added afterwards go to a private overlay, and evicting a
+saved entry only masks it out. With several workers the last save wins,
+and a missing or inconsistent index is treated as a cold cache.
+"""
+import json
+import os
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cache import get_cache_stats
+from config import settings
+
+semantic_cache_stats = get_cache_stats("chat_semantic")
+
+
+class SemanticCache:
+    """
+    Top-1 cosine-similarity cache of (embedding, response) pairs.
+    Slots [0, n_base) are rows of the loaded index (`_base`), slots from
+    n_base on are rows of `_overlay`; a slot is live while its scope id is
+    not -1.
+    """
+    def __init__(
+        self, capacity: int, threshold: float, path: str, save_every: int = 0
+    ):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.path = path
+        self.save_every = save_every
+        self._base: Optional[np.ndarray] = None  # (n_base, dim), read-only
+        self._overlay: Optional[np.ndarray] = None  # (capacity, dim)
+        self._overlay_size = 0
+        self._free_overlay: List[int] = []
+        self._scopes: Dict[str, int] = {}
+        self._size = 0
+        self._clock = 0
+        self._unsaved = 0
+        self._loaded = False
+        self._allocate_slots(0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(self, scope: str, embedding: List[float]) -> Optional[str]:
+        """Cached response of the most similar prompt above the threshold."""
+        self._ensure_loaded()
+        scope_id = self._scopes.get(scope)
+        dim = self._dim()
+        if dim is None or scope_id is None or self._size == 0:
+            semantic_cache_stats.miss()
+            return None
+
+        query = self._normalise(embedding)
+        if query.shape[0] != dim:
+            semantic_cache_stats.miss()
+            return None
+        scores = np.concatenate([
+            rows @ query for rows in (self._base, self._overlay_rows())
+            if rows is not None
+        ])
+        scores[self._scope_ids[:len(scores)] != scope_id] = -1.0
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            semantic_cache_stats.miss()
+            return None
+
+        semantic_cache_stats.hit()
+        self._touch(best)
+        return self._responses[best]
+
+    def add(self, scope: str, embedding: List[float], response: str) -> None:
+        """Insert a pair, evicting the least recently used entry when full."""
+        self._ensure_loaded()
+        vector = self._normalise(embedding)
+        dim = self._dim()
+        if dim is not None and vector.shape[0] != dim:
+            return
+        if self._overlay is None:
+            self._overlay = np.zeros(
+                (self.capacity, vector.shape[0]), dtype=np.float32
+            )
+
+        if self._size >= self.capacity:
+            self._evict(self._least_recently_used())
+        if self._free_overlay:
+            row = self._free_overlay.pop()
+        else:
+            row = self._overlay_size
+            self._overlay_size += 1
+
+        slot = self._n_base() + row
+        self._overlay[row] = vector
+        self._scope_ids[slot] = self._scopes.setdefault(scope, len(self._scopes))
+        self._responses[slot] = response
+        self._size += 1
+        self._touch(slot)
+
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every:
+            try:
+                self.save()
+            except OSError as e:
+                # Persisting is best effort; the shutdown save tries again
+                print(f"Semantic cache save failed: {e}")
+
+    def save(self) -> None:
+        """
+        Write the live entries next to `path`: the vectors go to a new
+        `<path>.<generation>.npy` and `<path>.json` is then atomically
+        replaced to point at it, so readers never see a mismatched pair.
+        """
+        if self._size == 0:
+            return
+        live = self._live_slots()
+        n_base = self._n_base()
+        parts = []
+        if self._base is not None:
+            parts.append(self._base[live[live < n_base]])
+        if self._overlay is not None:
+            parts.append(self._overlay[live[live >= n_base] - n_base])
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Unique per process, so workers saving at once never share files
+        generation = uuid.uuid4().hex
+        vectors_file = f"{self.path}.{generation}.npy"
+        meta_tmp = f"{self.path}.{generation}.json.tmp"
+        np.save(vectors_file, np.concatenate(parts))
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "vectors": os.path.basename(vectors_file),
+                "size": len(live),
+                "scopes": self._scopes,
+                "scope_ids": self._scope_ids[live].tolist(),
+                "last_used": self._last_used[live].tolist(),
+                "responses": [self._responses[i] for i in live],
+            }, f)
+
+        previous = self._read_meta()
+        os.replace(meta_tmp, f"{self.path}.json")
+        self._unsaved = 0
+        # Workers still mapping the old file keep reading it after unlink
+        if previous is not None and previous.get("vectors"):
+            try:
+                os.remove(os.path.join(directory, previous["vectors"]))
+            except OSError:
+                pass
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(f"{self.path}.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(f"{self.path}.json"):
+            return
+        try:
+            self._load()
+        except Exception as e:
+            # Any unreadable or inconsistent index just means a cold start
+            print(f"Semantic cache not loaded: {e}")
+            self._reset()
+
+    def _load(self) -> None:
+        meta = self._read_meta()
+        if meta is None:
+            raise ValueError("unreadable index metadata")
+        directory = os.path.dirname(self.path) or "."
+        vectors = np.load(
+            os.path.join(directory, meta["vectors"]), mmap_mode="r"
+        )
+        size = meta["size"]
+        if vectors.ndim != 2 or not (
+            vectors.shape[0] == size == len(meta["scope_ids"])
+            == len(meta["last_used"]) == len(meta["responses"])
+        ) or size == 0:
+            raise ValueError("index files do not match")
+        scope_ids = np.asarray(meta["scope_ids"], dtype=np.int32)
+        if scope_ids.min() < 0 or scope_ids.max() >= len(meta["scopes"]):
+            raise ValueError("index scopes do not match")
+
+        self._base = vectors
+        self._allocate_slots(size)
+        # Keep the most recently used entries live if capacity shrank
+        last_used = np.asarray(meta["last_used"], dtype=np.int64)
+        keep = np.argsort(last_used)[-self.capacity:]
+        self._scope_ids[keep] = scope_ids[keep]
+        self._last_used[keep] = last_used[keep]
+        for i in keep:
+            self._responses[i] = meta["responses"][i]
+        self._size = len(keep)
+        self._scopes = meta["scopes"]
+        self._clock = int(last_used.max())
+
+    def _reset(self) -> None:
+        self._base = None
+        self._overlay = None
+        self._overlay_size = 0
+        self._free_overlay = []
+        self._scopes = {}
+        self._size = 0
+        self._clock = 0
+        self._allocate_slots(0)
+
+    def _allocate_slots(self, n_base: int) -> None:
+        self._scope_ids = np.full(n_base + self.capacity, -1, dtype=np.int32)
+        self._last_used = np.zeros(n_base + self.capacity, dtype=np.int64)
+        self._responses: List[Optional[str]] = [None] * (
+            n_base + self.capacity
+        )
+
+    def _n_base(self) -> int:
+        return 0 if self._base is None else self._base.shape[0]
+
+    def _dim(self) -> Optional[int]:
+        for rows in (self._base, self._overlay):
+            if rows is not None:
+                return rows.shape[1]
+        return None
+
+    def _overlay_rows(self) -> Optional[np.ndarray]:
+        if self._overlay is None:
+            return None
+        return self._overlay[:self._overlay_size]
+
+    def _live_slots(self) -> np.ndarray:
+        used = self._n_base() + self._overlay_size
+        return np.flatnonzero(self._scope_ids[:used] >= 0)
+
+    def _least_recently_used(self) -> int:
+        live = self._live_slots()
+        return int(live[np.argmin(self._last_used[live])])
+
+    def _evict(self, slot: int) -> None:
+        # Saved rows are read-only; an evicted one is only masked out
+        self._scope_ids[slot] = -1
+        self._last_used[slot] = 0
+        self._responses[slot] = None
+        self._size -= 1
+        if slot >= self._n_base():
+            self._free_overlay.append(slot - self._n_base())
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    @staticmethod
+    def _normalise(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+semantic_cache = SemanticCache(
+    capacity=settings.semantic_cache_capacity,
+    threshold=settings.semantic_cache_threshold,
+    path=settings.semantic_cache_path,
+    save_every=settings.semantic_cache_save_every
+)
@@ -1,40 +1,83 @@
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
 from auth.execptions import (InvalidCredentialsException,
+                             InvalidTokenException,
+                             PasswordHashingBusyException,
+                             RateLimitExceededException,
+                             TokenExpiredException,
+                             TokenStoreUnavailableException,
                              UserAlreadyExistsException, raise_http_exception)
-from auth.models import Token, User, UserCredentials
+from auth.models import RefreshRequest, Token, User, UserCredentials
+from auth.rate_limit import (client_ip, enforce_login_rate_limit,
+                             enforce_register_rate_limit)
 from auth.service import AuthService
 from database import get_async_db
 
 router = APIRouter(prefix="/auth")
 
 
+def _client_ip(request: Request) -> str:
+    return client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for")
+    )
+
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_async_db)
 ):
     try:
+        # Reject floods before any database lookup or bcrypt work
+        await enforce_login_rate_limit(
+            _client_ip(request), form_data.username
+        )
         return await AuthService.authenticate_user(
             email=form_data.username,
             password=form_data.password,
             db=db
         )
-    except InvalidCredentialsException as e:
+    except (
+        InvalidCredentialsException,
+        PasswordHashingBusyException,
+        RateLimitExceededException
+    ) as e:
+        raise_http_exception(e)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshRequest = Body(...)):
+    try:
+        return await AuthService.refresh_tokens(request.refresh_token)
+    except (
+        InvalidTokenException,
+        TokenExpiredException,
+        TokenStoreUnavailableException
+    ) as e:
         raise_http_exception(e)
 
 
 @router.post("/register", response_model=Token)
 async def register_user(
+    request: Request,
     credentials: UserCredentials = Body(...),
     db: AsyncSession = Depends(get_async_db)
 ):
     try:
+        await enforce_register_rate_limit(
+            _client_ip(request), credentials.email
+        )
         return await AuthService.register_user(credentials, db)
-    except UserAlreadyExistsException as e:
+    except (
+        UserAlreadyExistsException,
+        PasswordHashingBusyException,
+        RateLimitExceededException
+    ) as e:
         raise_http_exception(e)
 
 
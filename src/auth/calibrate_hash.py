@@ -0,0 +1,90 @@
+"""
+bcrypt cost calibration for the current machine.
+
+Usage (from src/):
+    python -m auth.calibrate_hash
+    python -m auth.calibrate_hash --target-ms 250 --samples 7
+
+Times one hash at each cost factor and recommends the highest
+PASSWORD_HASH_ROUNDS whose median stays within the target latency. Run it
+on the deployment hardware; once the setting is changed, existing hashes
+are upgraded transparently the next time each user logs in.
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, Optional
+
+from passlib.hash import bcrypt
+
+from config import settings
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def time_rounds(rounds: int, samples: int) -> float:
+    """Median seconds to hash one password at `rounds`."""
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int) -> Dict[int, float]:
+    """
+    Time each cost factor in ascending order, stopping after the first one
+    over the target (every extra round doubles the cost).
+    """
+    results = {}
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        results[rounds] = time_rounds(rounds, samples) * 1000
+        print(f"rounds={rounds:>2}: {results[rounds]:7.1f} ms")
+        if results[rounds] > target_ms:
+            break
+    return results
+
+
+def recommend(results: Dict[int, float], target_ms: float) -> Optional[int]:
+    within = [rounds for rounds, ms in results.items() if ms <= target_ms]
+    return max(within) if within else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recommend a bcrypt cost for a target hash latency."
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=250,
+        help="acceptable time for one hash in milliseconds (default: 250)"
+    )
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    results = calibrate(args.target_ms, args.samples)
+    rounds = recommend(results, args.target_ms)
+    if rounds is None:
+        print(
+            f"Even rounds={MIN_ROUNDS} exceeds {args.target_ms:.0f} ms; "
+            f"keeping PASSWORD_HASH_ROUNDS={MIN_ROUNDS} is the safe minimum."
+        )
+        return
+
+    print(
+        f"Recommended: PASSWORD_HASH_ROUNDS={rounds} "
+        f"({results[rounds]:.1f} ms per hash, current setting "
+        f"{settings.password_hash_rounds})"
+    )
+    per_worker = 1000 / results[rounds]
+    print(
+        f"Capacity: ~{per_worker:.1f} logins/s per hashing process, "
+        f"~{per_worker * settings.password_hash_workers:.1f} per API worker "
+        f"with PASSWORD_HASH_WORKERS={settings.password_hash_workers}"
+    )
+
+
+if __name__ == "__main__":
+    main()
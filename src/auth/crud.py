@@ -1,5 +1,7 @@
 from typing import Optional
 
+from sqlalchemy import exists, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -48,6 +50,28 @@ class UserDAO:
             await db.rollback()
             raise DatabaseException(f"create_user: {str(e)}")
 
+    @staticmethod
+    async def create_user_if_absent(
+        email: str, hashed_password: str, db: AsyncSession
+    ) -> Optional[int]:
+        """
+        Create a user with a single INSERT ... ON CONFLICT (email) DO NOTHING.
+        Returns the new user's ID, or None if the email is already taken.
+        """
+        try:
+            result = await db.execute(
+                insert(User)
+                .values(email=email, hashed_password=hashed_password)
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User.id, User.email)
+            )
+            row = result.first()
+            await db.commit()
+            return row.id if row is not None else None
+        except Exception as e:
+            await db.rollback()
+            raise DatabaseException(f"create_user_if_absent: {str(e)}")
+
     @staticmethod
     async def update_user(user: User, db: AsyncSession) -> User:
         """Update an existing user."""
@@ -62,6 +86,26 @@ class UserDAO:
             await db.rollback()
             raise DatabaseException(f"update_user: {str(e)}")
 
+    @staticmethod
+    async def replace_password_hash(
+        user_id: int, old_hash: str, new_hash: str, db: AsyncSession
+    ) -> bool:
+        """
+        Swap a user's password hash only if it still equals `old_hash`, so a
+        concurrent password change is never overwritten.
+        """
+        try:
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            await db.rollback()
+            raise DatabaseException(f"replace_password_hash: {str(e)}")
+
     @staticmethod
     async def delete_user(user: User, db: AsyncSession) -> bool:
         """Delete a user."""
@@ -75,12 +119,12 @@ class UserDAO:
 
     @staticmethod
     async def user_exists(email: str, db: AsyncSession) -> bool:
-        """Check if user exists by email."""
+        """Check if user exists by email (index-only existence probe)."""
         try:
-            user = await UserDAO.get_user_by_email(email, db)
-            return user is not None
-        except DatabaseException:
-            raise
+            result = await db.execute(
+                select(exists().where(User.email == email))
+            )
+            return result.scalar()
         except Exception as e:
             raise DatabaseException(f"user_exists: {str(e)}")
 
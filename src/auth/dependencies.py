@@ -6,6 +6,7 @@ from auth.crud import UserDAO
 from auth.execptions import (InvalidTokenException, TokenExpiredException,
                              UserNotFoundException, raise_http_exception)
 from auth.models import User
+from auth.user_cache import user_cache
 from auth.utils import decode_access_token
 from database import get_async_db
 
@@ -18,11 +19,17 @@ async def get_current_user(
 ) -> User:
     try:
         email = decode_access_token(token)
+        user = user_cache.get(email)
+        if user is not None:
+            return user
+
         db_user = await UserDAO.get_user_by_email_or_raise(email, db)
-        return User(
+        user = User(
             id=db_user.id,
             email=db_user.email
         )
+        user_cache.set(user)
+        return user
     except (
         InvalidTokenException,
         TokenExpiredException,
@@ -0,0 +1,77 @@
+"""
+Bloom filter of registered emails kept in a Redis bitmap.
+
+Lets registration reject obviously taken emails before paying for a bcrypt
+hash. A negative answer is only trusted once the filter has been fully
+built by the rebuild_email_bloom Celery task; the unique index on
+users.email remains the source of truth either way.
+"""
+import hashlib
+from typing import Iterable, List
+
+from redis.exceptions import RedisError
+
+from cache import get_redis
+from config import settings
+
+EMAIL_BLOOM_KEY = "email_bloom"
+EMAIL_BLOOM_READY_KEY = "email_bloom:ready"
+
+
+def bloom_positions(email: str) -> List[int]:
+    """Bit positions for an email (k 32-bit slices of one SHA-256)."""
+    digest = hashlib.sha256(email.lower().encode()).digest()
+    return [
+        int.from_bytes(digest[i * 4:(i + 1) * 4], "big")
+        % settings.email_bloom_bits
+        for i in range(settings.email_bloom_hashes)
+    ]
+
+
+async def email_might_exist(email: str) -> bool:
+    """
+    False only if the email is definitely not registered.
+    Answers True when the filter is not built yet or Redis is unavailable.
+    """
+    args = []
+    for position in bloom_positions(email):
+        args.extend(["GET", "u1", position])
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.exists(EMAIL_BLOOM_READY_KEY)
+            pipe.execute_command("BITFIELD", EMAIL_BLOOM_KEY, *args)
+            ready, values = await pipe.execute()
+    except RedisError as e:
+        print(f"Email bloom filter unavailable: {e}")
+        return True
+    return not ready or all(values)
+
+
+async def add_email(email: str) -> None:
+    """Record a newly registered email in the filter."""
+    args = []
+    for position in bloom_positions(email):
+        args.extend(["SET", "u1", position, 1])
+    try:
+        await get_redis().execute_command("BITFIELD", EMAIL_BLOOM_KEY, *args)
+    except RedisError as e:
+        print(f"Email bloom filter update failed: {e}")
+
+
+def add_emails_sync(
+    client, emails: Iterable[str], key: str = EMAIL_BLOOM_KEY
+) -> int:
+    """
+    Record emails in the filter under `key` with a synchronous Redis client,
+    in one pipelined round trip. Returns the number of emails added.
+    """
+    added = 0
+    pipe = client.pipeline(transaction=False)
+    for email in emails:
+        args = []
+        for position in bloom_positions(email):
+            args.extend(["SET", "u1", position, 1])
+        pipe.execute_command("BITFIELD", key, *args)
+        added += 1
+    pipe.execute()
+    return added
@@ -53,6 +53,27 @@ class InsufficientPermissionsException(AuthException):
             super().__init__("Insufficient permissions")
 
 
+class PasswordHashingBusyException(AuthException):
+    """Raised when the password hashing pool is saturated."""
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__("Too many concurrent login attempts, retry shortly")
+
+
+class RateLimitExceededException(AuthException):
+    """Raised when a client or account exceeds an auth rate limit."""
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__("Too many requests, retry later")
+
+
+class TokenStoreUnavailableException(AuthException):
+    """Raised when the Redis refresh token store cannot be reached."""
+    def __init__(self, retry_after: int = 5):
+        self.retry_after = retry_after
+        super().__init__("Token refresh is temporarily unavailable")
+
+
 class DatabaseException(AuthException):
     """Raised when database operations fail."""
     def __init__(self, operation: str):
@@ -89,6 +110,21 @@ def raise_http_exception(exception: AuthException) -> HTTPException:
             status_code=status.HTTP_403_FORBIDDEN,
             detail=str(exception)
         )
+    elif isinstance(
+        exception,
+        (PasswordHashingBusyException, TokenStoreUnavailableException)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exception),
+            headers={"Retry-After": str(exception.retry_after)}
+        )
+    elif isinstance(exception, RateLimitExceededException):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exception),
+            headers={"Retry-After": str(exception.retry_after)}
+        )
     elif isinstance(exception, DatabaseException):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -16,10 +16,15 @@ class User(BaseModel):
 
 class Token(BaseModel):
     access_token: str
-    refresh_token: str
+    # None when the refresh token store is unavailable
+    refresh_token: str | None = None
     token_type: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     email: str | None = None
 
@@ -0,0 +1,188 @@
+"""
+Bulk user provisioning from CSV or NDJSON.
+
+Usage (from src/):
+    python -m auth.provision users.csv
+    python -m auth.provision users.ndjson --batch-size 2000 --workers 8
+
+Each record needs `email` and `password`; `name` and `age` are optional.
+Passwords are hashed across a process pool, emails that already exist are
+skipped before hashing, and users are inserted in batches with
+INSERT ... ON CONFLICT (email) DO NOTHING. Created emails are added to the
+registration Bloom filter so /auth/register keeps rejecting them early.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+import redis
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from auth.email_filter import add_emails_sync
+from auth.models import UserCreate
+from auth.schema import User
+from auth.utils import get_password_hash
+from config import settings
+from database import SyncSessionLocal, sync_engine
+
+
+def read_records(
+    path: str, fmt: str
+) -> Iterator[Optional[Dict[str, str]]]:
+    """
+    Yield raw user records from a CSV (with header) or NDJSON file; an
+    NDJSON line that is not a JSON object yields None.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield record if isinstance(record, dict) else None
+
+
+def _batches(records: Iterator[Dict[str, str]], size: int):
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def provision_users(
+    path: str, fmt: str, batch_size: int, workers: int
+) -> Dict[str, int]:
+    """Import users from `path`, returning per-outcome counts."""
+    counts = {"created": 0, "duplicates": 0, "invalid": 0}
+    seen = set()
+    start = time.perf_counter()
+    bloom_failed = False
+    client = redis.Redis.from_url(settings.redis_url)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            SyncSessionLocal() as db, client:
+        for batch in _batches(read_records(path, fmt), batch_size):
+            users: List[Dict[str, object]] = []
+            for record in batch:
+                if record is None:
+                    counts["invalid"] += 1
+                    continue
+                try:
+                    user = UserCreate(
+                        email=record.get("email"),
+                        password=record.get("password")
+                    )
+                    age = int(record["age"]) if record.get("age") else None
+                except (ValidationError, ValueError, TypeError):
+                    counts["invalid"] += 1
+                    continue
+                if user.email in seen:
+                    counts["duplicates"] += 1
+                    continue
+                seen.add(user.email)
+                users.append({
+                    "email": user.email,
+                    "password": user.password,
+                    "name": record.get("name") or None,
+                    "age": age
+                })
+            if not users:
+                continue
+
+            # Skip hashing for accounts that already exist
+            existing = set(db.execute(
+                select(User.email).where(
+                    User.email.in_([u["email"] for u in users])
+                )
+            ).scalars())
+            users = [u for u in users if u["email"] not in existing]
+            counts["duplicates"] += len(existing)
+
+            hashes = pool.map(
+                get_password_hash,
+                [u.pop("password") for u in users],
+                chunksize=max(1, len(users) // (workers * 4))
+            )
+            for user, hashed_password in zip(users, hashes):
+                user["hashed_password"] = hashed_password
+
+            created = db.execute(
+                insert(User)
+                .values(users)
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(User.email)
+            ).scalars().all() if users else []
+            db.commit()
+            counts["created"] += len(created)
+            try:
+                add_emails_sync(client, created)
+            except RedisError as e:
+                bloom_failed = True
+                print(
+                    f"Email bloom filter update failed: {e}", file=sys.stderr
+                )
+            # Lost a race with a concurrent registration
+            counts["duplicates"] += len(users) - len(created)
+
+            elapsed = time.perf_counter() - start
+            processed = sum(counts.values())
+            print(
+                f"{processed} processed, {counts['created']} created, "
+                f"{counts['duplicates']} duplicates, "
+                f"{counts['invalid']} invalid "
+                f"({processed / elapsed:,.0f} users/s)",
+                file=sys.stderr
+            )
+
+    if bloom_failed:
+        # Missing bits only cost a bcrypt hash per duplicate registration
+        # attempt (the insert still rejects it) until the next rebuild
+        print(
+            "Some created emails are missing from the Bloom filter; run the "
+            "rebuild_email_bloom task to restore it.",
+            file=sys.stderr
+        )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk user provisioning from CSV or NDJSON."
+    )
+    parser.add_argument("path", help="CSV or NDJSON file of users")
+    parser.add_argument(
+        "--format", choices=("csv", "ndjson"),
+        help="input format (default: from file extension)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    # SQL echo of multi-thousand-row INSERTs would dominate the run time
+    sync_engine.echo = False
+    start = time.perf_counter()
+    counts = provision_users(args.path, fmt, args.batch_size, args.workers)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(
+        f"Done in {elapsed:.1f}s: {counts['created']} created, "
+        f"{counts['duplicates']} duplicates, {counts['invalid']} invalid "
+        f"({total / elapsed if elapsed else 0:,.0f} users/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Redis sliding-window rate limiting for the credential endpoints.
+"""
+import ipaddress
+import math
+import time
+import uuid
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from auth.execptions import RateLimitExceededException
+from cache import get_redis
+from config import settings
+
+# Sliding-window log over one sorted set per key. All keys are checked
+# before any is recorded, so a rejected request consumes no quota.
+# KEYS: window keys. ARGV: now_ms, member, then (window_ms, limit) per key.
+# Returns 0 if allowed, otherwise milliseconds until a slot frees up.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    local limit = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        wait = math.max(wait, tonumber(oldest[2]) + window - now)
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+
+async def enforce_rate_limits(limits: List[Tuple[str, int, int]]) -> None:
+    """
+    Record one request against each (key, limit, window_seconds) limit.
+    Raises RateLimitExceededException if any limit is exhausted. Fails open
+    if Redis is unavailable.
+    """
+    args = [int(time.time() * 1000), uuid.uuid4().hex]
+    for _, limit, window_seconds in limits:
+        args.extend([window_seconds * 1000, limit])
+
+    try:
+        wait_ms = await get_redis().eval(
+            _SLIDING_WINDOW_SCRIPT,
+            len(limits),
+            *(key for key, _, _ in limits),
+            *args
+        )
+    except RedisError as e:
+        print(f"Rate limiter unavailable: {e}")
+        return
+
+    if wait_ms:
+        raise RateLimitExceededException(
+            retry_after=max(1, math.ceil(int(wait_ms) / 1000))
+        )
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(trusted_proxies: str) -> Tuple:
+    return tuple(
+        ipaddress.ip_network(entry.strip(), strict=False)
+        for entry in trusted_proxies.split(",")
+        if entry.strip()
+    )
+
+
+def _is_trusted_proxy(host: Optional[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except (TypeError, ValueError):
+        return False
+    return any(
+        address in network
+        for network in _trusted_networks(settings.trusted_proxies)
+    )
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str]) -> str:
+    """
+    Address to rate limit: the TCP peer, or, when the peer is a trusted
+    proxy, the right-most X-Forwarded-For entry that is not itself a
+    trusted proxy (entries further left are client-controlled).
+    """
+    if not _is_trusted_proxy(peer) or not forwarded_for:
+        return peer or "unknown"
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+async def enforce_login_rate_limit(client_ip: str, email: str) -> None:
+    window = settings.login_rate_limit_window_seconds
+    await enforce_rate_limits([
+        (f"ratelimit:login:ip:{client_ip}",
+         settings.login_rate_limit_per_ip, window),
+        (f"ratelimit:login:account:{email.lower()}",
+         settings.login_rate_limit_per_account, window),
+    ])
+
+
+async def enforce_register_rate_limit(client_ip: str, email: str) -> None:
+    window = settings.register_rate_limit_window_seconds
+    await enforce_rate_limits([
+        (f"ratelimit:register:ip:{client_ip}",
+         settings.register_rate_limit_per_ip, window),
+        (f"ratelimit:register:account:{email.lower()}",
+         settings.register_rate_limit_per_account, window),
+    ])
@@ -1,20 +1,114 @@
 """
 Auth service layer containing business logic for authentication.
 """
-from datetime import timedelta
-from typing import Dict
+import asyncio
+import time
+from typing import Dict, Optional, Set
 
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.crud import UserDAO
+from auth.email_filter import add_email, email_might_exist
 from auth.execptions import (InvalidCredentialsException,
+                             InvalidTokenException,
+                             PasswordHashingBusyException,
+                             TokenStoreUnavailableException,
                              UserAlreadyExistsException)
 from auth.models import UserCredentials
 from auth.schema import User as DBUser
-from auth.utils import create_access_token, get_password_hash, verify_password
+from auth.user_cache import user_cache
+from auth.utils import (create_access_token, create_refresh_token,
+                        decode_refresh_token, get_password_hash_async,
+                        get_password_hash_when_idle, password_needs_rehash,
+                        verify_password_async)
+from cache import get_redis
+from database import AsyncSessionLocal
+
+# Strong references to in-flight rehash tasks so they are not collected
+_rehash_tasks: Set[asyncio.Task] = set()
+
+
+def _refresh_token_key(jti: str) -> str:
+    return f"refresh:{jti}"
+
+
+def _user_refresh_tokens_key(email: str) -> str:
+    # Sorted set of the user's refresh token IDs, scored by expiry time
+    return f"refresh_user:{email}"
 
 
 class AuthService:
+    @staticmethod
+    async def _issue_tokens(email: str) -> Dict[str, Optional[str]]:
+        """
+        Create an access/refresh token pair. Login, registration and refresh
+        all issue access tokens for ACCESS_TOKEN_EXPIRE_MINUTES.
+        The refresh token's ID is stored in Redis until it expires; only
+        tokens whose ID is still present can be redeemed. If Redis is down
+        only the access token is issued, so login and registration (already
+        committed by then) still succeed.
+        """
+        access_token = create_access_token(data={"sub": email})
+        refresh_token, jti, expires_in = create_refresh_token(email)
+
+        user_key = _user_refresh_tokens_key(email)
+        now = time.time()
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                pipe.set(_refresh_token_key(jti), email, ex=expires_in)
+                # Drop IDs of tokens that expired without being redeemed
+                pipe.zremrangebyscore(user_key, 0, now)
+                pipe.zadd(user_key, {jti: now + expires_in})
+                pipe.expire(user_key, expires_in)
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Refresh token store unavailable: {e}")
+            refresh_token = None
+
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer"
+        }
+
+    @staticmethod
+    async def refresh_tokens(refresh_token: str) -> Dict[str, str]:
+        """
+        Redeem a refresh token for a new token pair (rotation).
+        Each refresh token can be used once; no database or bcrypt work.
+        """
+        email, jti = decode_refresh_token(refresh_token)
+
+        redis = get_redis()
+        try:
+            if await redis.getdel(_refresh_token_key(jti)) is None:
+                raise InvalidTokenException()
+            await redis.zrem(_user_refresh_tokens_key(email), jti)
+        except RedisError as e:
+            print(f"Refresh token store unavailable: {e}")
+            raise TokenStoreUnavailableException()
+
+        return await AuthService._issue_tokens(email)
+
+    @staticmethod
+    async def revoke_refresh_tokens(email: str) -> None:
+        """
+        Revoke every outstanding refresh token of a user.
+        Called after the account change has committed, so a Redis outage is
+        logged rather than failing the request; the tokens then stay valid
+        until they expire.
+        """
+        redis = get_redis()
+        user_key = _user_refresh_tokens_key(email)
+        try:
+            jtis = await redis.zrange(user_key, 0, -1)
+            await redis.delete(
+                user_key, *(_refresh_token_key(jti.decode()) for jti in jtis)
+            )
+        except RedisError as e:
+            print(f"Refresh token revocation for {email} failed: {e}")
+
     @staticmethod
     async def authenticate_user(
         email: str,
@@ -23,19 +117,41 @@ class AuthService:
     ) -> Dict[str, str]:
         user = await UserDAO.get_user_by_email(email, db)
 
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(
+            password, user.hashed_password
+        ):
             raise InvalidCredentialsException()
 
-        access_token_expires = timedelta(hours=1)
-        access_token = create_access_token(
-            data={"sub": user.email},
-            expires_delta=access_token_expires
-        )
+        if password_needs_rehash(user.hashed_password):
+            task = asyncio.create_task(AuthService._rehash_password(
+                user.id, user.email, password, user.hashed_password
+            ))
+            _rehash_tasks.add(task)
+            task.add_done_callback(_rehash_tasks.discard)
 
-        return {
-            "access_token": access_token,
-            "token_type": "bearer"
-        }
+        return await AuthService._issue_tokens(user.email)
+
+    @staticmethod
+    async def _rehash_password(
+        user_id: int, email: str, password: str, old_hash: str
+    ) -> None:
+        """
+        Re-hash a just-verified password at the configured cost, after the
+        login response has gone out. Skipped unless a hashing worker is
+        idle; the next login will try again.
+        """
+        try:
+            new_hash = await get_password_hash_when_idle(password)
+            async with AsyncSessionLocal() as db:
+                replaced = await UserDAO.replace_password_hash(
+                    user_id, old_hash, new_hash, db
+                )
+            if replaced:
+                await user_cache.invalidate(email)
+        except PasswordHashingBusyException:
+            pass
+        except Exception as e:
+            print(f"Password rehash for user {user_id} failed: {e}")
 
     @staticmethod
     async def register_user(
@@ -44,30 +160,24 @@ class AuthService:
     ) -> Dict[str, str]:
         """
         Register a new user.
-        Returns access token if successful.
+        Returns access and refresh tokens if successful.
         """
-        # Check if user already exists
-        if await UserDAO.user_exists(credentials.email, db):
-            raise UserAlreadyExistsException(credentials.email)
-
-        # Create new user
-        hashed_password = get_password_hash(credentials.password)
-        new_user = DBUser(
-            email=credentials.email,
-            hashed_password=hashed_password
-        )
-
-        created_user = await UserDAO.create_user(new_user, db)
+        # Reject visibly taken emails before paying for a bcrypt hash. The
+        # Bloom filter answers "definitely new" without touching Postgres.
+        if await email_might_exist(credentials.email):
+            if await UserDAO.user_exists(credentials.email, db):
+                raise UserAlreadyExistsException(credentials.email)
 
-        # Generate access token
-        access_token = create_access_token(
-            data={"sub": created_user.email}
+        hashed_password = await get_password_hash_async(credentials.password)
+        user_id = await UserDAO.create_user_if_absent(
+            credentials.email, hashed_password, db
         )
+        if user_id is None:
+            raise UserAlreadyExistsException(credentials.email)
+        await add_email(credentials.email)
 
-        return {
-            "access_token": access_token,
-            "token_type": "bearer"
-        }
+        # Generate access and refresh tokens
+        return await AuthService._issue_tokens(credentials.email)
 
     @staticmethod
     async def get_user_profile(user_id: int, db: AsyncSession) -> DBUser:
@@ -82,12 +192,17 @@ class AuthService:
     ) -> bool:
         """Update user password."""
         user = await UserDAO.get_user_by_id_or_raise(user_id, db)
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await get_password_hash_async(new_password)
         await UserDAO.update_user(user, db)
+        await user_cache.invalidate(user.email)
+        await AuthService.revoke_refresh_tokens(user.email)
         return True
 
     @staticmethod
     async def delete_user_account(user_id: int, db: AsyncSession) -> bool:
         """Delete user account."""
         user = await UserDAO.get_user_by_id_or_raise(user_id, db)
-        return await UserDAO.delete_user(user, db)
+        deleted = await UserDAO.delete_user(user, db)
+        await user_cache.invalidate(user.email)
+        await AuthService.revoke_refresh_tokens(user.email)
+        return deleted
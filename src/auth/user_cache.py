@@ -0,0 +1,78 @@
+"""
+Per-worker cache of authenticated users for get_current_user.
+
+Entries are invalidated locally and broadcast to the other workers over
+Redis pub/sub whenever an account changes.
+"""
+import asyncio
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from auth.models import User
+from cache import LRUTTLCache, get_cache_stats, get_redis
+from config import settings
+
+USER_INVALIDATION_CHANNEL = "auth:user_invalidate"
+
+user_cache_stats = get_cache_stats("user")
+
+
+class UserCache:
+    """LRU+TTL cache of email -> User kept coherent across workers."""
+    def __init__(self):
+        self._cache = LRUTTLCache(
+            maxsize=settings.user_cache_max_size,
+            ttl=settings.user_cache_ttl_seconds
+        )
+        self._listener: Optional[asyncio.Task] = None
+
+    def get(self, email: str) -> Optional[User]:
+        self._ensure_listener()
+        user = self._cache.get(email)
+        if user is None:
+            user_cache_stats.miss()
+        else:
+            user_cache_stats.hit()
+        return user
+
+    def set(self, user: User) -> None:
+        self._cache.set(user.email, user)
+
+    async def invalidate(self, email: str) -> None:
+        """Drop the user here and tell every other worker to do the same."""
+        self._cache.delete(email)
+        try:
+            await get_redis().publish(USER_INVALIDATION_CHANNEL, email)
+        except RedisError as e:
+            print(f"User cache invalidation publish failed: {e}")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(
+                self._listen()
+            )
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(USER_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._cache.delete(message["data"].decode())
+            except RedisError as e:
+                print(f"User cache invalidation listener error: {e}")
+                # Invalidations may have been missed while disconnected
+                self._cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+user_cache = UserCache()
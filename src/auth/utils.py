@@ -1,17 +1,43 @@
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from auth.execptions import InvalidTokenException, TokenExpiredException
+from auth.execptions import (InvalidTokenException,
+                             PasswordHashingBusyException,
+                             TokenExpiredException)
+from cache import LRUTTLCache, get_cache_stats
 from config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max pinned to the default so needs_update() flags any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_hash_rounds,
+    bcrypt__min_rounds=settings.password_hash_rounds,
+    bcrypt__max_rounds=settings.password_hash_rounds
+)
 
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+REFRESH_TOKEN_TYPE = "refresh"
+
+# token digest -> (email, exp); skips signature checks for repeated tokens
+_token_cache = LRUTTLCache(
+    maxsize=settings.jwt_cache_max_size,
+    ttl=settings.jwt_cache_ttl_seconds
+)
+token_cache_stats = get_cache_stats("jwt")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -24,6 +50,93 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a deprecated scheme or another cost."""
+    return pwd_context.needs_update(hashed_password)
+
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_in_flight = 0
+# Jobs finish on the pool's management thread, not the event loop
+_hash_in_flight_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    # Created lazily so each server worker process gets its own pool
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers
+        )
+    return _hash_executor
+
+
+def _hash_job_done(future: Optional[Future]) -> None:
+    global _hash_in_flight
+    with _hash_in_flight_lock:
+        _hash_in_flight -= 1
+
+
+async def _run_hash_job(
+    fn: Callable[..., Any], *args: Any, capacity: Optional[int] = None
+) -> Any:
+    """
+    Run a bcrypt call in the hashing process pool.
+    Raises PasswordHashingBusyException when `capacity` jobs are already in
+    flight (default: every worker busy and the queue full).
+    """
+    global _hash_in_flight
+    if capacity is None:
+        capacity = (
+            settings.password_hash_workers + settings.password_hash_queue_depth
+        )
+    with _hash_in_flight_lock:
+        if _hash_in_flight >= capacity:
+            raise PasswordHashingBusyException()
+        _hash_in_flight += 1
+
+    try:
+        future = _get_hash_executor().submit(fn, *args)
+    except BaseException:
+        _hash_job_done(None)
+        raise
+    # Released when the job itself ends: a cancelled or timed-out caller
+    # does not stop a bcrypt call that is already running
+    future.add_done_callback(_hash_job_done)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_hash_job(get_password_hash, password)
+
+
+async def get_password_hash_when_idle(password: str) -> str:
+    """
+    Hash a password only if a hashing worker is idle, so background work
+    never queues ahead of logins.
+    Raises PasswordHashingBusyException otherwise.
+    """
+    return await _run_hash_job(
+        get_password_hash, password, capacity=settings.password_hash_workers
+    )
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing process pool."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -41,19 +154,80 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 def decode_access_token(token: str) -> str:
     """
     Decode JWT token and return email.
+    Verified tokens are cached until their `exp`, at most
+    JWT_CACHE_TTL_SECONDS.
     Raises InvalidTokenException or TokenExpiredException.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        email, exp = cached
+        if exp > time.time():
+            token_cache_stats.hit()
+            return email
+        _token_cache.delete(key)
+        raise TokenExpiredException()
+
+    token_cache_stats.miss()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        exp = payload.get("exp")
+        if email is None or exp is None:
+            raise InvalidTokenException()
+        # Refresh tokens must not be usable as access tokens
+        if payload.get("type") == REFRESH_TOKEN_TYPE:
             raise InvalidTokenException()
-        return email
     except jwt.ExpiredSignatureError:
         raise TokenExpiredException()
     except JWTError:
         raise InvalidTokenException()
 
+    remaining = exp - time.time()
+    if remaining > 0:
+        _token_cache.set(
+            key, (email, exp), ttl=min(remaining, settings.jwt_cache_ttl_seconds)
+        )
+    return email
+
+
+def create_refresh_token(email: str) -> Tuple[str, str, int]:
+    """
+    Create a JWT refresh token.
+    Returns the token, its unique ID (jti) and its lifetime in seconds.
+    """
+    jti = uuid.uuid4().hex
+    expires_in = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+    to_encode = {
+        "sub": email,
+        "jti": jti,
+        "type": REFRESH_TOKEN_TYPE,
+        "exp": datetime.utcnow() + timedelta(seconds=expires_in)
+    }
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt, jti, expires_in
+
+
+def decode_refresh_token(token: str) -> Tuple[str, str]:
+    """
+    Decode a refresh token and return (email, jti).
+    Only the signature and expiry are checked here; revocation state is
+    kept in Redis by AuthService.
+    Raises InvalidTokenException or TokenExpiredException.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise TokenExpiredException()
+    except JWTError:
+        raise InvalidTokenException()
+
+    email = payload.get("sub")
+    jti = payload.get("jti")
+    if payload.get("type") != REFRESH_TOKEN_TYPE or not email or not jti:
+        raise InvalidTokenException()
+    return email, jti
+
 
 def validate_token(token: str) -> bool:
     """Validate if token is valid without raising exceptions."""
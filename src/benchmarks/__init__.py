@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for performance-sensitive paths, kept out of the runtime
+modules. Run each from src/, e.g. `python -m benchmarks.login_storm`.
+"""
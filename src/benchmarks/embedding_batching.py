@@ -0,0 +1,57 @@
+"""
+Throughput of coalesced embedding requests.
+
+Usage (from src/):
+    python -m benchmarks.embedding_batching
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from assitant.batching import EmbeddingBatcher
+
+
+async def benchmark_coalescing(
+    calls: int = 1000, concurrency: int = 100, latency: float = 0.05
+) -> None:
+    """
+    Compare one-request-per-text against coalesced batches with a fake
+    embeddings endpoint that takes `latency` seconds per HTTP request and
+    allows `concurrency` requests in flight.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    requests = 0
+
+    async def fake_batch(texts: List[str], model: str) -> List[List[float]]:
+        nonlocal requests
+        async with limit:
+            requests += 1
+            await asyncio.sleep(latency)
+            return [[float(len(text))] for text in texts]
+
+    async def run(embed: Callable[[str], Awaitable[List[float]]]) -> float:
+        nonlocal requests
+        requests = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(embed(f"text {i}") for i in range(calls)))
+        return time.perf_counter() - start
+
+    unbatched = await run(
+        lambda text: _first(fake_batch([text], "benchmark"))
+    )
+    unbatched_requests = requests
+    batcher = EmbeddingBatcher(fake_batch, max_batch=256, max_wait=0.005)
+    batched = await run(lambda text: batcher.embed(text, "benchmark"))
+
+    print(f"unbatched: {calls / unbatched:,.0f} embeddings/s "
+          f"({unbatched_requests} requests)")
+    print(f"  batched: {calls / batched:,.0f} embeddings/s "
+          f"({requests} requests)")
+
+
+async def _first(result: Awaitable[List[List[float]]]) -> Optional[List[float]]:
+    return (await result)[0]
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark_coalescing())
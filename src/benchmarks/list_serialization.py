@@ -0,0 +1,66 @@
+"""
+Per-row serialization cost of the task list response.
+
+Usage (from src/):
+    python -m benchmarks.list_serialization
+
+Compares building Pydantic models (re-validated as FastAPI does for a
+response_model) against dumping Row tuples straight to orjson.
+"""
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import orjson
+
+from tasks.models import Task, TaskPage
+from tasks.utils import EXPORT_COLUMNS
+
+
+def benchmark_list_serialization(rows: int = 10000, repeat: int = 5) -> None:
+    """Compare per-row cost of Pydantic vs. Row -> orjson list responses."""
+    now = datetime.utcnow()
+    TaskRow = namedtuple("TaskRow", EXPORT_COLUMNS)
+    data = [
+        TaskRow(i, f"Task {i}", "Some description", i % 2 == 0, now, now)
+        for i in range(rows)
+    ]
+
+    def pydantic_path() -> bytes:
+        page = TaskPage(
+            items=[
+                Task(
+                    id=row.id,
+                    title=row.title,
+                    description=row.description,
+                    completed=row.completed,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at
+                )
+                for row in data
+            ],
+            next_cursor=None
+        )
+        # FastAPI re-validates the returned model against response_model
+        validated = TaskPage.model_validate(page.model_dump())
+        return validated.model_dump_json().encode()
+
+    def orjson_path() -> bytes:
+        return orjson.dumps({
+            "items": [row._asdict() for row in data],
+            "next_cursor": None
+        })
+
+    for name, fn in (("pydantic", pydantic_path), ("orjson", orjson_path)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{name:>8}: {best / rows * 1e6:.2f} us/row "
+              f"({best * 1e3:.1f} ms for {rows} rows)")
+
+
+if __name__ == "__main__":
+    benchmark_list_serialization()
@@ -0,0 +1,61 @@
+"""
+Event-loop lag during a burst of concurrent logins.
+
+Usage (from src/):
+    python -m benchmarks.login_storm
+
+Fires concurrent bcrypt verifications and measures how late an unrelated
+10 ms ticker fires meanwhile, for the old blocking path ("sync") and the
+hashing process pool ("pool").
+"""
+import asyncio
+import time
+
+from auth.execptions import PasswordHashingBusyException
+from auth.utils import (get_password_hash, shutdown_password_hasher,
+                        verify_password, verify_password_async)
+
+
+async def benchmark_login_storm(logins: int = 16, mode: str = "pool") -> None:
+    """
+    Fire `logins` concurrent bcrypt verifications and measure how late an
+    unrelated 10 ms ticker fires meanwhile ("sync" = old blocking path).
+    """
+    hashed = get_password_hash("benchmark-password")
+    delays = []
+    storm_done = asyncio.Event()
+
+    async def ticker():
+        while not storm_done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append(time.perf_counter() - start - 0.01)
+
+    async def login():
+        if mode == "sync":
+            verify_password("benchmark-password", hashed)
+            await asyncio.sleep(0)
+        else:
+            try:
+                await verify_password_async("benchmark-password", hashed)
+            except PasswordHashingBusyException:
+                pass
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    storm_done.set()
+    await ticker_task
+
+    delays.sort()
+    p99 = delays[int(len(delays) * 0.99) - 1] if delays else 0.0
+    print(f"{mode:>5}: storm {elapsed * 1e3:.0f} ms, ticker lag "
+          f"max {max(delays, default=0) * 1e3:.1f} ms, "
+          f"p99 {p99 * 1e3:.1f} ms over {len(delays)} ticks")
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark_login_storm(mode="sync"))
+    asyncio.run(benchmark_login_storm(mode="pool"))
+    shutdown_password_hasher()
@@ -0,0 +1,35 @@
+"""
+Access token decode throughput with and without the verified-token cache.
+
+Usage (from src/):
+    python -m benchmarks.token_decode
+"""
+import time
+
+from jose import jwt
+
+from auth.utils import (ALGORITHM, SECRET_KEY, create_access_token,
+                        decode_access_token)
+
+
+def benchmark_token_decode(iterations: int = 20000) -> None:
+    """Compare decode throughput for cached vs. uncached access tokens."""
+    token = create_access_token({"sub": "benchmark@example.com"})
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    uncached = time.perf_counter() - start
+
+    decode_access_token(token)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_access_token(token)
+    cached = time.perf_counter() - start
+
+    print(f"uncached: {iterations / uncached:,.0f} decodes/s")
+    print(f"  cached: {iterations / cached:,.0f} decodes/s")
+
+
+if __name__ == "__main__":
+    benchmark_token_decode()
@@ -0,0 +1,107 @@
+"""
+Shared Redis client, in-process LRU/TTL cache and cache hit/miss metrics.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import redis.asyncio as redis
+
+from config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the process-wide Redis client (backed by a connection pool)."""
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.redis_url)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the process-wide Redis client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class LRUTTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL."""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value; `ttl` overrides the cache default if given."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStats:
+    """Hit/miss counters for one named cache in this process."""
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        self.hits += 1
+
+    def miss(self) -> None:
+        self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_stats: Dict[str, CacheStats] = {}
+
+
+def get_cache_stats(name: str) -> CacheStats:
+    """Get (or register) the counters for the named cache."""
+    if name not in _stats:
+        _stats[name] = CacheStats(name)
+    return _stats[name]
+
+
+def render_cache_metrics() -> str:
+    """Render all cache counters in the Prometheus text format."""
+    lines = [
+        "# TYPE cache_hits_total counter",
+        "# TYPE cache_misses_total counter",
+    ]
+    for stats in _stats.values():
+        lines.append(f'cache_hits_total{{cache="{stats.name}"}} {stats.hits}')
+        lines.append(
+            f'cache_misses_total{{cache="{stats.name}"}} {stats.misses}'
+        )
+    return "\n".join(lines) + "\n"
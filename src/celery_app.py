@@ -0,0 +1,41 @@
+from celery import Celery
+from celery.schedules import crontab
+from config import settings
+
+celery_app = Celery(
+    "tasks",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+    include=["tasks.background_tasks"]  # Path to tasks module relative to PYTHONPATH (src/)
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+)
+
+# Example of a periodic task: runs every day at midnight
+celery_app.conf.beat_schedule = {
+    'fetch-data-every-day': {
+        'task': 'tasks.background_tasks.fetch_data_and_save_to_db', # Task path relative to PYTHONPATH
+        'schedule': crontab(hour=0, minute=0), # Everyday at midnight
+    },
+    'reconcile-task-stats-every-5-minutes': {
+        'task': 'tasks.background_tasks.reconcile_task_stats',
+        'schedule': crontab(minute='*/5'), # Corrects drift in /tasks/stats counters
+    },
+    'archive-completed-tasks-every-hour': {
+        'task': 'tasks.background_tasks.archive_completed_tasks',
+        'schedule': crontab(minute=30), # Every hour at :30
+    },
+    'rebuild-email-bloom-every-day': {
+        'task': 'tasks.background_tasks.rebuild_email_bloom',
+        'schedule': crontab(hour=3, minute=0), # Drops bits of deleted users
+    },
+}
+
+if __name__ == "__main__":
+    celery_app.start()
\ No newline at end of file
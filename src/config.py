@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    refresh_token_expire_days: int = 7
 
     # Add the missing fields here
     openai_api_key: str # Assuming this is a string key
@@ -14,6 +15,78 @@ class Settings(BaseSettings):
     celery_result_backend: str # Or AnyUrl
     redis_url: str # Or AnyUrl
 
+    # Rows fetched per round trip by the server-side cursor behind /tasks/export
+    task_export_fetch_size: int = 1000
+    # Upper bound on items accepted by one /tasks/bulk request
+    task_bulk_max_items: int = 10000
+    # How long single-task reads stay in the Redis cache
+    task_cache_ttl_seconds: int = 60
+    # Task change feed (/tasks/changes): events kept for resuming clients and
+    # events buffered per subscriber before a slow client is cut off
+    task_changes_stream_maxlen: int = 10000
+    task_changes_queue_size: int = 256
+    # Archival of completed tasks into tasks_archive (archive_completed_tasks)
+    task_archive_after_days: int = 90
+    task_archive_batch_size: int = 1000
+    task_archive_max_batches: int = 500
+    task_archive_batch_pause_seconds: float = 0.2
+
+    # bcrypt runs in a per-worker process pool; requests beyond
+    # workers + queue depth are rejected with 503 instead of queueing
+    password_hash_workers: int = 2
+    password_hash_queue_depth: int = 16
+    # bcrypt cost factor for new hashes (tune with `python -m auth.calibrate_hash`);
+    # hashes at any other cost are upgraded on the user's next login
+    password_hash_rounds: int = 12
+
+    # Sliding-window limits for /auth/token and /auth/register, per client IP
+    # and per account email
+    login_rate_limit_per_ip: int = 20
+    login_rate_limit_per_account: int = 5
+    login_rate_limit_window_seconds: int = 60
+    register_rate_limit_per_ip: int = 5
+    register_rate_limit_per_account: int = 3
+    register_rate_limit_window_seconds: int = 3600
+    # Comma-separated IPs/CIDRs of reverse proxies (e.g. "10.0.0.0/8"). The
+    # per-IP limits use X-Forwarded-For only when the peer is one of these;
+    # otherwise every client behind the proxy shares the proxy's limit
+    trusted_proxies: str = ""
+
+    # Redis Bloom filter of registered emails (2^24 bits = 2 MiB)
+    email_bloom_bits: int = 1 << 24
+    email_bloom_hashes: int = 7
+
+    # Per-worker cache of authenticated users used by get_current_user
+    user_cache_max_size: int = 10000
+    user_cache_ttl_seconds: int = 60
+    # Per-worker cache of verified access tokens (never outlives token exp)
+    jwt_cache_max_size: int = 10000
+    jwt_cache_ttl_seconds: int = 300
+
+    # Shared HTTP pool behind the cached OpenAI clients (assitant registry)
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry_seconds: float = 30.0
+    openai_http2: bool = True
+    openai_timeout_seconds: float = 60.0
+    # Assistants kept per worker, one per requested model (LRU beyond this)
+    openai_assistant_cache_size: int = 64
+    # Lifetime of exact-match cached chat completions
+    chat_cache_ttl_seconds: int = 86400
+    # Semantic cache: reuse a cached answer when a cacheable prompt's embedding
+    # is at least this cosine-similar to a previous one; saved under
+    # <path>.json (+ .npy vectors) every SEMANTIC_CACHE_SAVE_EVERY inserts
+    # (0 = never) and on shutdown
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_capacity: int = 10000
+    semantic_cache_path: str = "data/semantic_cache"
+    semantic_cache_save_every: int = 500
+    # generate_embeddings coalesces concurrent calls for up to this long, or
+    # until this many texts are waiting, then sends them as one request
+    embedding_batch_max_wait_ms: float = 5.0
+    embedding_batch_max_size: int = 256
+
     # You can optionally configure Pydantic to ignore extra fields,
     # but adding them explicitly is generally better practice.
     # model_config = SettingsConfigDict(
@@ -1,45 +1,156 @@
-from fastapi import Depends, FastAPI, HTTPException, Request
+import json
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 import os
 
-from src.assitant import get_assistant, ASSISTANT_TYPE_OPENAI # Adjusted path
+from assitant import assistant_registry, get_assistant, ASSISTANT_TYPE_OPENAI
+from assitant.metrics import get_histogram, render_chat_metrics
+from assitant.semantic_cache import semantic_cache
+from assitant.response_cache import (chat_cache_key, get_cached_response,
+                                         should_cache, store_response)
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from typing import Optional # Added for ChatRequest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth.api import router as auth_router # Adjusted path
-from src.database import get_async_db, get_db # Adjusted path
-from src.tasks.api import router as tasks_router # Adjusted path
+# Modules are imported from src/ (PYTHONPATH), the same root the routers use,
+# so shutdown hooks and /metrics see the instances the app actually runs
+from auth.api import router as auth_router
+from auth.user_cache import user_cache
+from auth.utils import shutdown_password_hasher
+from cache import close_redis, render_cache_metrics
+from database import get_async_db
+from tasks.api import router as tasks_router
+from tasks.changes import task_change_feed
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release per-worker pools on shutdown
+    await assistant_registry.close()
+    try:
+        semantic_cache.save()
+    except Exception as e:
+        # Persisting the cache is best effort; keep shutting down
+        print(f"Semantic cache save failed: {e}")
+    await task_change_feed.close()
+    await user_cache.close()
+    await close_redis()
+    shutdown_password_hasher()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 class ChatRequest(BaseModel):
     message: str
     assistant_type: Optional[str] = "openai" # Defaults to openai, can be omitted by frontend
-    model_name: Optional[str] = None
+    model_name: Optional[str] = Field(None, max_length=100)
+    temperature: Optional[float] = None
+    cache: Optional[bool] = None # Cached by default only when temperature is 0
+
+    def sampling_params(self) -> dict:
+        return {"temperature": self.temperature} if self.temperature is not None else {}
 
 class ChatResponse(BaseModel):
     response: str
+    cached: bool = False
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat_with_assistant(request: ChatRequest, db: AsyncSession = Depends(get_db)):
+async def chat_with_assistant(request: ChatRequest, response: Response):
     try:
         # assistant_type will default to 'openai' if not provided by the client
         # or can be explicitly set to 'openai' if the client still sends it.
         # We force OpenAI usage here regardless of what client might send for assistant_type
-        assistant = get_assistant("openai", model_name=request.model_name)
+        # Assistants (and their HTTP pools) are cached per model, not rebuilt per request
+        assistant = get_assistant(ASSISTANT_TYPE_OPENAI, model_name=request.model_name)
         
-        ai_response = await assistant.get_chat_response(request.message)
-        return ChatResponse(response=ai_response)
+        ai_response, cached = await assistant.cached_chat_response(
+            [{"role": "user", "content": request.message}],
+            cache=request.cache,
+            **request.sampling_params()
+        )
+        response.headers["X-Cache"] = "HIT" if cached else "MISS"
+        return ChatResponse(response=ai_response, cached=cached)
     except ValueError as e: # Should not happen if get_assistant is robust
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error in chat_with_assistant: {e}")
         raise HTTPException(status_code=500, detail="An internal error occurred.")
 
+chat_ttft = get_histogram("chat_time_to_first_token_seconds")
+chat_stream_duration = get_histogram("chat_stream_duration_seconds")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream the assistant's reply as Server-Sent Events: `token` events with
+    text deltas, then `done` (with timings and `cached`) or `error`.
+    A cache hit is sent as a single token.
+    """
+    try:
+        assistant = get_assistant(ASSISTANT_TYPE_OPENAI, model_name=request.model_name)
+    except Exception as e:
+        print(f"Error in chat_stream: {e}")
+        raise HTTPException(status_code=500, detail="An internal error occurred.")
+
+    messages = [{"role": "user", "content": request.message}]
+    params = request.sampling_params()
+    cache_key = None
+    if should_cache(params, request.cache):
+        cache_key = chat_cache_key(assistant.model_name, messages, params)
+
+    async def events():
+        start = time.perf_counter()
+        first_token_at = None
+        cached = False
+        parts = []
+        try:
+            if cache_key is not None:
+                text = await get_cached_response(cache_key)
+                if text is not None:
+                    cached = True
+                    first_token_at = time.perf_counter()
+                    yield _sse("token", {"text": text})
+            if not cached:
+                async for delta in assistant.stream_chat_response(messages, **params):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        chat_ttft.observe(first_token_at - start)
+                    parts.append(delta)
+                    yield _sse("token", {"text": delta})
+        except Exception as e:
+            print(f"Error in chat_stream: {e}")
+            yield _sse("error", {"detail": "An internal error occurred."})
+            return
+
+        elapsed = time.perf_counter() - start
+        if not cached:
+            chat_stream_duration.observe(elapsed)
+            if cache_key is not None:
+                await store_response(cache_key, "".join(parts).strip())
+        yield _sse("done", {
+            "ttft_ms": round((first_token_at - start) * 1000) if first_token_at else None,
+            "total_ms": round(elapsed * 1000),
+            "cached": cached
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 
@@ -55,8 +166,9 @@ async def read_root():
 
 
 # Add routers
-app.include_router(auth_router, prefix="/auth", tags=["auth"])
-app.include_router(task_router, prefix="/tasks", tags=["tasks"])
+# The routers carry their own /auth and /tasks prefixes
+app.include_router(auth_router, tags=["auth"])
+app.include_router(tasks_router)
 
 @app.get("/health")
 async def check_health(db: AsyncSession = Depends(get_async_db)):
@@ -68,3 +180,9 @@ async def check_health(db: AsyncSession = Depends(get_async_db)):
         )
 
     return {"status": "ok", "database": "connected"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Cache hit/miss counters and chat latencies for this worker, in Prometheus format."""
+    return render_cache_metrics() + render_chat_metrics()
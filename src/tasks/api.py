@@ -1,42 +1,194 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import (APIRouter, Body, Depends, Header, Query, Request,
+                     Response, status)
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from database import get_async_db
+from tasks.changes import task_change_feed
 from tasks.exceptions import (TaskNotFoundException, TaskValidationException,
                               raise_http_exception)
-from tasks.models import Task, TaskCreate, TaskUpdate
+from tasks.models import (Task, TaskBulkDelete, TaskBulkDeleteResult,
+                          TaskBulkResult, TaskBulkUpdateItem, TaskCreate,
+                          TaskFilter, TaskPage, TaskSearchPage, TaskStats,
+                          TaskUpdate)
 from tasks.service import TaskService
+from tasks.utils import etag_matches, make_etag
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.get("/", response_model=List[Task])
-async def get_tasks(db: AsyncSession = Depends(get_async_db)):
-    """Get all tasks."""
+@router.get("/", response_model=TaskPage)
+async def get_tasks(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    filters: TaskFilter = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a filtered, sorted page of tasks.
+    Returns 304 if the list is unchanged since the client's ETag.
+    """
     try:
-        tasks = await TaskService.get_all_tasks(db)
-        return [
-            Task(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                completed=task.completed,
-                created_at=task.created_at,
-                updated_at=task.updated_at
+        version = await TaskService.get_tasks_version(db)
+        etag = make_etag(version, request.query_params)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag}
             )
-            for task in tasks
-        ]
+
+        rows, next_cursor = await TaskService.get_tasks_page(
+            db, limit, filters, cursor
+        )
+        # Rows already match TaskPage; skip per-row model validation
+        return ORJSONResponse(
+            {
+                "items": [row._asdict() for row in rows],
+                "next_cursor": next_cursor
+            },
+            headers={"ETag": etag}
+        )
+    except Exception as e:
+        raise_http_exception(e)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_task_stats(db: AsyncSession = Depends(get_async_db)):
+    """Get total, completed and pending task counts."""
+    try:
+        return await TaskService.get_task_stats(db)
+    except Exception as e:
+        raise_http_exception(e)
+
+
+@router.get("/changes")
+async def task_changes(
+    last_event_id: Optional[str] = Header(None),
+    since: Optional[str] = Query(None)
+):
+    """
+    Server-Sent Events feed of task changes.
+    Reconnect with Last-Event-ID (or ?since=) to receive missed events.
+    """
+    return StreamingResponse(
+        task_change_feed.subscribe(last_event_id or since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/search", response_model=TaskSearchPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over task titles and descriptions."""
+    try:
+        rows, next_cursor = await TaskService.search_tasks(
+            db, q, limit, cursor
+        )
+        # Rows already match TaskSearchPage; skip per-row model validation
+        return ORJSONResponse({
+            "items": [row._asdict() for row in rows],
+            "next_cursor": next_cursor
+        })
+    except Exception as e:
+        raise_http_exception(e)
+
+
+@router.get("/export")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    fetch_size: int = Query(settings.task_export_fetch_size, ge=1, le=10000)
+):
+    """Stream all tasks as NDJSON or CSV."""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        TaskService.export_tasks(format, fetch_size),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=tasks.{format}"
+        }
+    )
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_create_tasks(
+    items: List[TaskCreate] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many tasks in one transaction."""
+    try:
+        tasks, errors = await TaskService.bulk_create_tasks(items, db)
+        return TaskBulkResult(
+            items=[Task.model_validate(task) for task in tasks],
+            errors=errors
+        )
+    except Exception as e:
+        raise_http_exception(e)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    items: List[TaskBulkUpdateItem] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update many tasks in one transaction."""
+    try:
+        tasks, errors = await TaskService.bulk_update_tasks(items, db)
+        return TaskBulkResult(
+            items=[Task.model_validate(task) for task in tasks],
+            errors=errors
+        )
+    except Exception as e:
+        raise_http_exception(e)
+
+
+@router.delete("/bulk", response_model=TaskBulkDeleteResult)
+async def bulk_delete_tasks(
+    data: TaskBulkDelete = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete many tasks in one transaction."""
+    try:
+        deleted_ids, errors = await TaskService.bulk_delete_tasks(
+            data.ids, db
+        )
+        return TaskBulkDeleteResult(deleted_ids=deleted_ids, errors=errors)
     except Exception as e:
         raise_http_exception(e)
 
 
 @router.get("/{task_id}", response_model=Task)
-async def get_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
-    """Get a specific task by ID."""
+async def get_task(
+    task_id: int,
+    response: Response,
+    include_archived: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific task by ID.
+    Returns 304 if the task is unchanged since the client's ETag.
+    """
     try:
-        task = await TaskService.get_task_by_id(task_id, db)
+        task = await TaskService.get_task_by_id(
+            task_id, db, include_archived
+        )
+        etag = make_etag(task.id, task.updated_at)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag}
+            )
+        response.headers["ETag"] = etag
         return Task(
             id=task.id,
             title=task.title,
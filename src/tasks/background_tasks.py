@@ -1,5 +1,45 @@
-from src.celery import celery_app
-from src.database import get_async_db, get_sync_db # Assuming you might need both
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import redis as redis_sync
+from sqlalchemy import select, text
+
+from auth.email_filter import (EMAIL_BLOOM_KEY, EMAIL_BLOOM_READY_KEY,
+                               add_emails_sync)
+from auth.schema import User
+from celery_app import celery_app
+from config import settings
+from database import SyncSessionLocal, get_async_db, get_sync_db # Assuming you might need both
+from tasks.changes import TASK_CHANGES_STREAM
+from tasks.crud import task_counts_query
+from tasks.utils import (TASK_STATS_COMPLETED_KEY, TASK_STATS_TOTAL_KEY,
+                         queue_task_invalidation)
+
+# Moves one bounded batch of old completed tasks into tasks_archive in a
+# single statement. SKIP LOCKED keeps the batch from waiting on rows that
+# API requests are currently writing.
+ARCHIVE_BATCH_SQL = text("""
+    WITH moved AS (
+        DELETE FROM tasks
+        WHERE id IN (
+            SELECT id FROM tasks
+            WHERE completed = true
+              AND updated_at < now() - make_interval(days => :days)
+            ORDER BY updated_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, title, description, completed, created_at, updated_at
+    )
+    INSERT INTO tasks_archive
+        (id, title, description, completed, created_at, updated_at,
+         archived_at)
+    SELECT id, title, description, completed, created_at, updated_at, now()
+    FROM moved
+    RETURNING id
+""")
 # from sqlalchemy.ext.asyncio import AsyncSession # If using async within tasks
 # from sqlalchemy.orm import Session # If using sync within tasks
 
@@ -52,7 +92,7 @@ async def fetch_data_and_save_to_db_async():
 #     time.sleep(1)
 #     print("Data saved to database (sync).")
 
-@celery_app.task(name='src.tasks.background_tasks.fetch_data_and_save_to_db')
+@celery_app.task(name='tasks.background_tasks.fetch_data_and_save_to_db')
 def fetch_data_and_save_to_db(): # Synchronous wrapper if needed, or make the core logic sync
     """Celery task to fetch data and save it to the database."""
     print("Starting daily data fetching task...")
@@ -67,12 +107,122 @@ def fetch_data_and_save_to_db(): # Synchronous wrapper if needed, or make the co
     # import asyncio
     # asyncio.run(fetch_data_and_save_to_db_async())
 
+@celery_app.task(name='tasks.background_tasks.reconcile_task_stats')
+def reconcile_task_stats():
+    """
+    Recount tasks in Postgres and overwrite the Redis counters behind
+    GET /tasks/stats, correcting any drift from missed increments.
+    Increments applied between the count and the overwrite are lost, so
+    each run can leave that window's writes uncounted until the next one.
+    """
+    with SyncSessionLocal() as db:
+        total, completed = db.execute(task_counts_query()).one()
+
+    client = redis_sync.Redis.from_url(settings.redis_url)
+    try:
+        client.mset({
+            TASK_STATS_TOTAL_KEY: total,
+            TASK_STATS_COMPLETED_KEY: completed
+        })
+    finally:
+        client.close()
+    return {"total": total, "completed": completed}
+
+def _ensure_archive_partitions(db):
+    """Create this month's and next month's tasks_archive partitions."""
+    this_month = db.execute(
+        text("SELECT date_trunc('month', now())::timestamp")
+    ).scalar_one()
+    for offset in (0, 1):
+        year = this_month.year + (this_month.month - 1 + offset) // 12
+        month = (this_month.month - 1 + offset) % 12 + 1
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS tasks_archive_{start:%Y_%m} "
+            f"PARTITION OF tasks_archive "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        ))
+    db.commit()
+
+
+@celery_app.task(name='tasks.background_tasks.archive_completed_tasks')
+def archive_completed_tasks():
+    """
+    Move completed tasks older than TASK_ARCHIVE_AFTER_DAYS into the
+    partitioned tasks_archive table, one short transaction per batch with a
+    pause in between so row locks are never held for long.
+    """
+    archived = 0
+    client = redis_sync.Redis.from_url(settings.redis_url)
+    try:
+        with SyncSessionLocal() as db:
+            _ensure_archive_partitions(db)
+            for _ in range(settings.task_archive_max_batches):
+                task_ids = db.execute(
+                    ARCHIVE_BATCH_SQL,
+                    {
+                        "days": settings.task_archive_after_days,
+                        "batch_size": settings.task_archive_batch_size
+                    }
+                ).scalars().all()
+                db.commit()
+                if not task_ids:
+                    break
+
+                archived += len(task_ids)
+                pipe = client.pipeline()
+                queue_task_invalidation(
+                    pipe, task_ids, settings.task_cache_ttl_seconds
+                )
+                pipe.execute()
+                # Archived tasks leave the live list
+                client.xadd(
+                    TASK_CHANGES_STREAM,
+                    {"op": "archived", "ids": json.dumps(task_ids)},
+                    maxlen=settings.task_changes_stream_maxlen,
+                    approximate=True
+                )
+                if len(task_ids) < settings.task_archive_batch_size:
+                    break
+                time.sleep(settings.task_archive_batch_pause_seconds)
+    finally:
+        client.close()
+
+    if archived:
+        reconcile_task_stats()
+    return {"archived": archived}
+
+@celery_app.task(name='tasks.background_tasks.rebuild_email_bloom')
+def rebuild_email_bloom():
+    """
+    Rebuild the registered-email Bloom filter from the users table into a
+    scratch key, then swap it in atomically and mark the filter ready.
+    """
+    scratch_key = f"{EMAIL_BLOOM_KEY}:rebuild"
+    added = 0
+    client = redis_sync.Redis.from_url(settings.redis_url)
+    try:
+        client.delete(scratch_key)
+        with SyncSessionLocal() as db:
+            emails = db.execute(
+                select(User.email).execution_options(yield_per=1000)
+            ).scalars()
+            for partition in emails.partitions():
+                added += add_emails_sync(client, partition, scratch_key)
+
+        pipe = client.pipeline()
+        if added:
+            pipe.rename(scratch_key, EMAIL_BLOOM_KEY)
+        else:
+            pipe.delete(EMAIL_BLOOM_KEY)
+        pipe.set(EMAIL_BLOOM_READY_KEY, 1)
+        pipe.execute()
+    finally:
+        client.close()
+    return {"emails": added}
+
 # Example of another simple task
 @celery_app.task
 def add(x, y):
     return x + y
-
-# You'll need to import asyncio and datetime if you use the async placeholders
-import asyncio
-from datetime import datetime
-import time # For sync example
\ No newline at end of file
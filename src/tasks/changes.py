@@ -0,0 +1,195 @@
+"""
+Live task change feed backed by a capped Redis stream.
+
+TaskService writes append events to the stream. Each worker runs a single
+XREAD listener that fans events out to per-subscriber bounded queues, and
+stream entry IDs double as SSE resume tokens (Last-Event-ID).
+"""
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from cache import get_redis
+from config import settings
+
+TASK_CHANGES_STREAM = "task_changes"
+KEEPALIVE_SECONDS = 15
+
+
+def _id_key(event_id: str) -> Tuple[int, int]:
+    millis, _, seq = event_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def _format_event(
+    event: str, data: str, event_id: Optional[str] = None
+) -> str:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {data}\n\n"
+
+
+class _Subscriber:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+
+class TaskChangeFeed:
+    """Publishes task changes and fans them out to SSE subscribers."""
+    def __init__(self):
+        self._subscribers: Set[_Subscriber] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, op: str, task_ids: List[int]) -> None:
+        """Append a change event for the given tasks to the stream."""
+        if not task_ids:
+            return
+        try:
+            await get_redis().xadd(
+                TASK_CHANGES_STREAM,
+                {"op": op, "ids": json.dumps(task_ids)},
+                maxlen=settings.task_changes_stream_maxlen,
+                approximate=True
+            )
+        except RedisError as e:
+            print(f"Task change publish failed: {e}")
+
+    async def subscribe(
+        self, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE-formatted change events, first replaying anything after
+        `last_event_id`, then live events. A `reset` event means events were
+        lost (resume token too old or client too slow) and the client should
+        refetch its task list.
+        """
+        subscriber = _Subscriber(settings.task_changes_queue_size)
+        # Register before replaying so no event falls between the two
+        self._subscribers.add(subscriber)
+        try:
+            await self._ensure_listener()
+            sent = last_event_id
+            if last_event_id:
+                try:
+                    _id_key(last_event_id)
+                    backlog, complete = await self._read_backlog(
+                        last_event_id
+                    )
+                except (ValueError, RedisError):
+                    backlog, complete = [], False
+                if not complete:
+                    sent = None
+                    yield _format_event("reset", "{}")
+                for event_id, op, data in backlog:
+                    yield _format_event(op, data, event_id)
+                    sent = event_id
+
+            while True:
+                if subscriber.overflowed and subscriber.queue.empty():
+                    yield _format_event("reset", "{}")
+                    return
+                try:
+                    event_id, op, data = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if sent and _id_key(event_id) <= _id_key(sent):
+                    continue
+                yield _format_event(op, data, event_id)
+                sent = event_id
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def close(self) -> None:
+        """Stop this worker's stream listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        # Fix the listener's start before the caller replays its backlog.
+        # The replay then reads at least this far, so replayed and live
+        # events overlap (and are deduplicated) instead of leaving a gap.
+        try:
+            start_id = await self._latest_id()
+        except RedisError:
+            start_id = None
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(
+                self._listen(start_id)
+            )
+
+    async def _read_backlog(
+        self, last_event_id: str
+    ) -> Tuple[List[Tuple[str, str, str]], bool]:
+        """
+        Read the events after `last_event_id`.
+        Returns the events and whether the stream still covers the gap.
+        """
+        redis = get_redis()
+        first = await redis.xrange(TASK_CHANGES_STREAM, count=1)
+        entries = await redis.xrange(
+            TASK_CHANGES_STREAM, min=f"({last_event_id}"
+        )
+        backlog = [self._decode(entry_id, fields)
+                   for entry_id, fields in entries]
+        complete = not first or (
+            _id_key(first[0][0].decode()) <= _id_key(last_event_id)
+        )
+        return backlog, complete
+
+    async def _listen(self, last_id: Optional[str] = None) -> None:
+        """
+        Single XREAD loop per worker feeding every subscriber queue,
+        starting after `last_id` (default: the newest entry).
+        """
+        # Read from a concrete ID, never "$": with "$" each XREAD starts at
+        # the stream's end, skipping whatever was appended between reads
+        while self._subscribers:
+            try:
+                if last_id is None:
+                    last_id = await self._latest_id()
+                streams = await get_redis().xread(
+                    {TASK_CHANGES_STREAM: last_id},
+                    count=100,
+                    block=KEEPALIVE_SECONDS * 1000
+                )
+            except RedisError as e:
+                print(f"Task change listener error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            for _, entries in streams:
+                for entry_id, fields in entries:
+                    event = self._decode(entry_id, fields)
+                    last_id = event[0]
+                    for subscriber in list(self._subscribers):
+                        try:
+                            subscriber.queue.put_nowait(event)
+                        except asyncio.QueueFull:
+                            # Drop slow clients instead of buffering forever
+                            subscriber.overflowed = True
+                            self._subscribers.discard(subscriber)
+
+    @staticmethod
+    async def _latest_id() -> str:
+        """ID of the newest stream entry, or "0-0" if the stream is empty."""
+        latest = await get_redis().xrevrange(TASK_CHANGES_STREAM, count=1)
+        return latest[0][0].decode() if latest else "0-0"
+
+    @staticmethod
+    def _decode(entry_id: bytes, fields: dict) -> Tuple[str, str, str]:
+        return (
+            entry_id.decode(),
+            fields[b"op"].decode(),
+            json.dumps({"ids": json.loads(fields[b"ids"])})
+        )
+
+
+task_change_feed = TaskChangeFeed()
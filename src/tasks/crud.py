@@ -1,11 +1,127 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import (Boolean, Integer, Row, String, any_, bindparam, cast,
+                        column, delete, func, insert, tuple_, union_all,
+                        update)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import Select
 
 from tasks.exceptions import DatabaseException, TaskNotFoundException
-from tasks.schema import Task
+from tasks.models import TaskFilter
+from tasks.schema import Task, TaskArchive, TaskListVersion
+
+# Columns returned by the list endpoints; selected as plain Row tuples so no
+# ORM objects are built per row
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.completed,
+    Task.created_at,
+    Task.updated_at,
+)
+
+TASK_FIELDS = tuple(col.key for col in TASK_COLUMNS)
+
+
+def _typed_array(name: str, items: List[Any], item_type) -> Any:
+    """
+    Bind a list as a single array parameter with an explicit cast, so
+    Postgres never has to infer the element type (e.g. from all NULLs).
+    """
+    return cast(bindparam(name, items, type_=ARRAY(item_type)), ARRAY(item_type))
+
+
+def _apply_filters(query: Select, filters: TaskFilter, model=Task) -> Select:
+    if filters.completed is not None:
+        query = query.where(model.completed == filters.completed)
+    if filters.created_after is not None:
+        query = query.where(model.created_at > filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(model.created_at < filters.created_before)
+    if filters.updated_since is not None:
+        query = query.where(model.updated_at >= filters.updated_since)
+    return query
+
+
+def _task_models(filters: TaskFilter) -> tuple:
+    """
+    Tables to read: tasks, plus tasks_archive when filters.include_archived
+    is set. Only completed tasks are archived, so the archive is skipped
+    when filtering for incomplete ones.
+    """
+    if filters.include_archived and filters.completed is not False:
+        return (Task, TaskArchive)
+    return (Task,)
+
+
+def _task_select(filters: TaskFilter, model=Task) -> Select:
+    return _apply_filters(
+        select(*(getattr(model, field) for field in TASK_FIELDS)),
+        filters,
+        model
+    )
+
+
+def _ordered_page(
+    query: Select,
+    columns,
+    filters: TaskFilter,
+    limit: int,
+    after: Optional[Tuple[datetime, int]]
+) -> Select:
+    """Keyset condition, (order_by, id) ordering and limit for `query`."""
+    descending = filters.order_by.startswith("-")
+    order_column = columns[filters.order_by.lstrip("-")]
+    if after is not None:
+        key = tuple_(order_column, columns.id)
+        query = query.where(
+            key < tuple_(*after) if descending else key > tuple_(*after)
+        )
+    if descending:
+        query = query.order_by(order_column.desc(), columns.id.desc())
+    else:
+        query = query.order_by(order_column, columns.id)
+    return query.limit(limit)
+
+
+def _tasks_page_query(
+    filters: TaskFilter,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None
+) -> Select:
+    """
+    Up to `limit` filtered tasks in (filters.order_by, id) order, after the
+    given key.
+
+    With the archive included, each table is paged on its own and the
+    pages are merged: Postgres does not push ORDER BY/LIMIT into a
+    UNION ALL with range filters, and would otherwise sort every match.
+    """
+    models = _task_models(filters)
+    pages = [
+        _ordered_page(
+            _task_select(filters, model), model.__table__.c, filters, limit, after
+        )
+        for model in models
+    ]
+    if len(pages) == 1:
+        return pages[0]
+
+    tasks = union_all(*pages).subquery("filtered_tasks")
+    return _ordered_page(select(tasks), tasks.c, filters, limit, None)
+
+
+def task_counts_query() -> Select:
+    """(total, completed) task counts; shared with the reconcile job."""
+    return select(
+        func.count(Task.id),
+        func.count(Task.id).filter(Task.completed.is_(True))
+    )
 
 
 class TaskDAO:
@@ -20,6 +136,92 @@ class TaskDAO:
         except Exception as e:
             raise DatabaseException(f"get_all_tasks: {str(e)}")
 
+    @staticmethod
+    async def get_tasks_page(
+        db: AsyncSession,
+        limit: int,
+        filters: TaskFilter,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Row]:
+        """
+        Get up to `limit` filtered task rows ordered by (filters.order_by, id),
+        starting after the given key.
+        """
+        query = _tasks_page_query(filters, limit, after)
+        try:
+            result = await db.execute(query)
+            return result.all()
+        except Exception as e:
+            raise DatabaseException(f"get_tasks_page: {str(e)}")
+
+    @staticmethod
+    async def get_tasks_version(db: AsyncSession) -> int:
+        """Get the task list version (bumped by every write to tasks)."""
+        query = select(func.sum(TaskListVersion.version))
+        try:
+            result = await db.execute(query)
+            return int(result.scalar_one() or 0)
+        except Exception as e:
+            raise DatabaseException(f"get_tasks_version: {str(e)}")
+
+    @staticmethod
+    async def get_task_counts(db: AsyncSession) -> Tuple[int, int]:
+        """Count all tasks and completed tasks with one full scan."""
+        try:
+            result = await db.execute(task_counts_query())
+            total, completed = result.one()
+            return total, completed
+        except Exception as e:
+            raise DatabaseException(f"get_task_counts: {str(e)}")
+
+    @staticmethod
+    async def search_tasks(
+        db: AsyncSession,
+        text: str,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None
+    ) -> List[Row]:
+        """
+        Full-text search over title/description using the GIN-indexed
+        search_vector. Returns task rows with a trailing `rank` column,
+        ordered by rank, then id.
+        """
+        ts_query = func.websearch_to_tsquery("english", text)
+        rank = func.ts_rank_cd(Task.search_vector, ts_query)
+
+        query = select(*TASK_COLUMNS, rank.label("rank")).where(
+            Task.search_vector.op("@@")(ts_query)
+        )
+        if after is not None:
+            query = query.where(tuple_(rank, Task.id) < tuple_(*after))
+        query = query.order_by(rank.desc(), Task.id.desc()).limit(limit)
+
+        try:
+            result = await db.execute(query)
+            return result.all()
+        except Exception as e:
+            raise DatabaseException(f"search_tasks: {str(e)}")
+
+    @staticmethod
+    async def stream_tasks(
+        db: AsyncSession, fetch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream all task rows through a server-side cursor.
+        Yields batches of at most `fetch_size` column tuples.
+        """
+        query = (
+            select(*TASK_COLUMNS)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        try:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                yield partition
+        except Exception as e:
+            raise DatabaseException(f"stream_tasks: {str(e)}")
+
     @staticmethod
     async def get_task_by_id(task_id: int, db: AsyncSession) -> Optional[Task]:
         """Get task by ID."""
@@ -31,12 +233,14 @@ class TaskDAO:
             raise DatabaseException(f"get_task_by_id: {str(e)}")
 
     @staticmethod
-    async def create_task(task: Task, db: AsyncSession) -> Task:
-        """Create a new task."""
+    async def create_task(values: Dict[str, Any], db: AsyncSession) -> Task:
+        """Create a new task with a single INSERT ... RETURNING."""
         try:
-            db.add(task)
+            result = await db.scalars(
+                insert(Task).values(**values).returning(Task)
+            )
+            task = result.one()
             await db.commit()
-            await db.refresh(task)
             return task
         except IntegrityError as e:
             await db.rollback()
@@ -46,26 +250,182 @@ class TaskDAO:
             raise DatabaseException(f"create_task: {str(e)}")
 
     @staticmethod
-    async def update_task(task: Task, db: AsyncSession) -> Task:
-        """Update an existing task."""
+    async def update_task(
+        task_id: int, values: Dict[str, Any], db: AsyncSession
+    ) -> Tuple[Task, Optional[bool]]:
+        """
+        Update an existing task with a single UPDATE ... RETURNING.
+        Returns the updated task and its previous `completed` value.
+        Raises TaskNotFoundException if no row matched.
+        """
+        previous = (
+            select(Task.id, Task.completed.label("previous_completed"))
+            .where(Task.id == task_id)
+            .with_for_update()
+            .subquery()
+        )
         try:
+            result = await db.execute(
+                update(Task)
+                .where(Task.id == previous.c.id)
+                .values(**values)
+                .returning(Task, previous.c.previous_completed)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
             await db.commit()
-            await db.refresh(task)
-            return task
         except Exception as e:
             await db.rollback()
             raise DatabaseException(f"update_task: {str(e)}")
+        if row is None:
+            raise TaskNotFoundException(task_id)
+        return row[0], row[1]
 
     @staticmethod
-    async def delete_task(task: Task, db: AsyncSession) -> bool:
-        """Delete a task."""
+    async def delete_task(task_id: int, db: AsyncSession) -> Optional[bool]:
+        """
+        Delete a task with a single DELETE ... RETURNING.
+        Returns the deleted task's `completed` value.
+        Raises TaskNotFoundException if no row matched.
+        """
         try:
-            await db.delete(task)
+            result = await db.execute(
+                delete(Task)
+                .where(Task.id == task_id)
+                .returning(Task.id, Task.completed)
+            )
+            row = result.one_or_none()
             await db.commit()
-            return True
         except Exception as e:
             await db.rollback()
             raise DatabaseException(f"delete_task: {str(e)}")
+        if row is None:
+            raise TaskNotFoundException(task_id)
+        return row.completed
+
+    @staticmethod
+    async def bulk_create_tasks(
+        rows: List[Dict[str, Any]], db: AsyncSession
+    ) -> List[Task]:
+        """
+        Create many tasks with multi-row INSERT ... RETURNING.
+        Tasks are returned in input order, even when SQLAlchemy splits the
+        rows over several INSERT statements.
+        """
+        try:
+            result = await db.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                rows
+            )
+            tasks = result.all()
+            await db.commit()
+            return tasks
+        except Exception as e:
+            await db.rollback()
+            raise DatabaseException(f"bulk_create_tasks: {str(e)}")
+
+    @staticmethod
+    async def bulk_update_tasks(
+        rows: List[Tuple[int, Optional[str], Optional[str], Optional[bool]]],
+        db: AsyncSession
+    ) -> List[Tuple[Task, Optional[bool]]]:
+        """
+        Update many tasks with one UPDATE ... FROM unnest(...) statement.
+        Each row is (id, title, description, completed); None keeps the
+        current value. Returns (task, previous completed) for the tasks
+        that exist.
+        Each column is bound as one typed array, so the statement has a
+        fixed number of parameters whatever the batch size, and all-NULL
+        columns keep their type.
+        """
+        ids, titles, descriptions, completed = (
+            [list(col) for col in zip(*rows)] if rows else ([], [], [], [])
+        )
+        id_array = _typed_array("ids", ids, Integer)
+        data = func.unnest(
+            id_array,
+            _typed_array("titles", titles, String),
+            _typed_array("descriptions", descriptions, String),
+            _typed_array("completed", completed, Boolean)
+        ).table_valued(
+            column("id", Integer),
+            column("title", String),
+            column("description", String),
+            column("completed", Boolean)
+        ).render_derived(name="data")
+        previous = (
+            select(Task.id, Task.completed.label("previous_completed"))
+            .where(Task.id == any_(id_array))
+            .with_for_update()
+            .subquery()
+        )
+        query = (
+            update(Task)
+            .where(Task.id == data.c.id, Task.id == previous.c.id)
+            .values(
+                title=func.coalesce(data.c.title, Task.title),
+                description=func.coalesce(
+                    data.c.description, Task.description
+                ),
+                completed=func.coalesce(data.c.completed, Task.completed)
+            )
+            .returning(Task, previous.c.previous_completed)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await db.execute(query)
+            updated = [(task, previous_completed)
+                       for task, previous_completed in result.all()]
+            await db.commit()
+            return updated
+        except Exception as e:
+            await db.rollback()
+            raise DatabaseException(f"bulk_update_tasks: {str(e)}")
+
+    @staticmethod
+    async def bulk_delete_tasks(
+        task_ids: List[int], db: AsyncSession
+    ) -> List[Tuple[int, Optional[bool]]]:
+        """
+        Delete many tasks with DELETE ... WHERE id = ANY(...).
+        Returns (id, completed) for each deleted task.
+        """
+        query = (
+            delete(Task)
+            .where(
+                Task.id == any_(
+                    bindparam("task_ids", task_ids, type_=ARRAY(Integer))
+                )
+            )
+            .returning(Task.id, Task.completed)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await db.execute(query)
+            deleted = [(task_id, completed)
+                       for task_id, completed in result.all()]
+            await db.commit()
+            return deleted
+        except Exception as e:
+            await db.rollback()
+            raise DatabaseException(f"bulk_delete_tasks: {str(e)}")
+
+    @staticmethod
+    async def get_archived_task_by_id_or_raise(
+        task_id: int, db: AsyncSession
+    ) -> TaskArchive:
+        """Get an archived task by ID or raise TaskNotFoundException."""
+        try:
+            query = select(TaskArchive).where(TaskArchive.id == task_id)
+            result = await db.execute(query)
+            task = result.scalars().first()
+        except Exception as e:
+            raise DatabaseException(
+                f"get_archived_task_by_id: {str(e)}"
+            )
+        if task is None:
+            raise TaskNotFoundException(task_id)
+        return task
 
     @staticmethod
     async def get_task_by_id_or_raise(task_id: int, db: AsyncSession) -> Task:
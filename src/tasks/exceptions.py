@@ -22,6 +22,12 @@ class TaskValidationException(TaskException):
         super().__init__(f"Task validation error: {message}")
 
 
+class InvalidCursorException(TaskValidationException):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self):
+        super().__init__("Invalid cursor")
+
+
 class DatabaseException(TaskException):
     """Raised when database operations fail."""
     def __init__(self, operation: str):
@@ -36,6 +42,11 @@ def raise_http_exception(exception: TaskException) -> HTTPException:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(exception)
         )
+    elif isinstance(exception, InvalidCursorException):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exception)
+        )
     elif isinstance(exception, TaskValidationException):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class TaskBase(BaseModel):
@@ -27,3 +27,65 @@ class Task(TaskBase):
 
     class Config:
         from_attributes = True
+
+
+class TaskFilter(BaseModel):
+    completed: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    order_by: Literal[
+        "created_at", "-created_at", "updated_at", "-updated_at"
+    ] = "created_at"
+    include_archived: bool = False
+
+    @field_validator("created_after", "created_before", "updated_since")
+    @classmethod
+    def to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Task timestamps are stored as naive UTC
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class TaskPage(BaseModel):
+    items: List[Task]
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class TaskBulkResult(BaseModel):
+    items: List[Task] = []
+    errors: List[BulkItemError] = []
+
+
+class TaskBulkDeleteResult(BaseModel):
+    deleted_ids: List[int] = []
+    errors: List[BulkItemError] = []
+
+
+class TaskSearchResult(Task):
+    rank: float
+
+
+class TaskSearchPage(BaseModel):
+    items: List[TaskSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class TaskStats(BaseModel):
+    total: int
+    completed: int
+    pending: int
@@ -1,4 +1,7 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import (BigInteger, Boolean, Column, Computed, DateTime, Index,
+                        Integer, String)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from database import Base
@@ -13,3 +16,62 @@ class Task(Base):
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Maintained by Postgres; deferred so regular task loads skip it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(title, '') || ' ' || "
+            "coalesce(description, ''))",
+            persisted=True
+        )
+    ))
+
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_tasks_completed_created_at_id",
+            "completed", "created_at", "id"
+        ),
+        Index(
+            "ix_tasks_completed_updated_at_id",
+            "completed", "updated_at", "id"
+        ),
+        Index(
+            "ix_tasks_search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
+
+
+class TaskArchive(Base):
+    """Completed tasks moved out of `tasks`, partitioned by archive month."""
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    completed = Column(Boolean)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(
+        DateTime, primary_key=True, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_tasks_archive_created_at_id", "created_at", "id"),
+        Index("ix_tasks_archive_updated_at_id", "updated_at", "id"),
+        {"postgresql_partition_by": "RANGE (archived_at)"},
+    )
+
+
+class TaskListVersion(Base):
+    """
+    Counter slots bumped by triggers on `tasks` in the same transaction as
+    every write; their sum is the version behind GET /tasks/ ETags. Each
+    write takes a slot no other writer holds, so writers do not queue on
+    a single row.
+    """
+    __tablename__ = "task_list_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
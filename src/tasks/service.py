@@ -1,27 +1,272 @@
 """
 Task service layer containing business logic for task operations.
 """
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
+from redis.exceptions import RedisError
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cache import get_cache_stats, get_redis
+from config import settings
+from database import AsyncSessionLocal
+from tasks.changes import task_change_feed
 from tasks.crud import TaskDAO
-from tasks.exceptions import TaskValidationException
-from tasks.models import TaskCreate, TaskUpdate
+from tasks.exceptions import TaskNotFoundException, TaskValidationException
+from tasks.models import (BulkItemError, Task, TaskBulkUpdateItem,
+                          TaskCreate, TaskFilter, TaskStats, TaskUpdate)
 from tasks.schema import Task as DBTask
+from tasks.utils import (EXPORT_COLUMNS, TASK_STATS_COMPLETED_KEY,
+                         TASK_STATS_TOTAL_KEY, decode_cursor, encode_cursor,
+                         queue_task_invalidation, rows_to_csv,
+                         rows_to_ndjson, task_cache_key, task_version_key)
+
+
+task_cache_stats = get_cache_stats("task")
+
+
+# Store a read-through copy only if no write invalidated the task since the
+# reader looked up its version, so a stale DB read is never cached.
+# KEYS: task key, version key. ARGV: version seen ('' if none), value, ttl.
+_FILL_TASK_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Only adjust counters that have been seeded; missing counters are rebuilt
+# from Postgres on the next read instead of starting from zero.
+_ADJUST_STATS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1
+    and redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('INCRBY', KEYS[1], ARGV[1])
+    redis.call('INCRBY', KEYS[2], ARGV[2])
+end
+"""
+
+# Seed counters from a Postgres count only where they are still missing, so
+# a concurrent reader's seed (and any deltas applied since) is never
+# overwritten. Returns the counters as stored.
+# KEYS: total key, completed key. ARGV: total, completed.
+_SEED_STATS_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'NX')
+redis.call('SET', KEYS[2], ARGV[2], 'NX')
+return redis.call('MGET', KEYS[1], KEYS[2])
+"""
 
 
 class TaskService:
 
+    @staticmethod
+    async def _invalidate_cached_tasks(*task_ids: int) -> None:
+        """Drop cached copies of the given tasks after a write."""
+        if not task_ids:
+            return
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                queue_task_invalidation(
+                    pipe, task_ids, settings.task_cache_ttl_seconds
+                )
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Task cache invalidation failed: {e}")
+
+    @staticmethod
+    async def _adjust_stats(total: int = 0, completed: int = 0) -> None:
+        """Apply a write's delta to the Redis task counters."""
+        if not total and not completed:
+            return
+        try:
+            await get_redis().eval(
+                _ADJUST_STATS_SCRIPT,
+                2,
+                TASK_STATS_TOTAL_KEY,
+                TASK_STATS_COMPLETED_KEY,
+                total,
+                completed
+            )
+        except RedisError as e:
+            print(f"Task stats update failed: {e}")
+
+    @staticmethod
+    async def get_task_stats(db: AsyncSession) -> TaskStats:
+        """
+        Get total/completed/pending task counts from the Redis counters.
+        Counters are rebuilt from Postgres only if they are missing. Writes
+        that commit between that count and the seed are not counted (the
+        counters do not exist yet when they adjust them); the periodic
+        reconcile_task_stats job corrects that drift.
+        """
+        try:
+            total, completed = await get_redis().mget(
+                TASK_STATS_TOTAL_KEY, TASK_STATS_COMPLETED_KEY
+            )
+        except RedisError as e:
+            print(f"Task stats read failed: {e}")
+            total = completed = None
+
+        if total is None or completed is None:
+            total, completed = await TaskDAO.get_task_counts(db)
+            try:
+                total, completed = await get_redis().eval(
+                    _SEED_STATS_SCRIPT,
+                    2,
+                    TASK_STATS_TOTAL_KEY,
+                    TASK_STATS_COMPLETED_KEY,
+                    total,
+                    completed
+                )
+            except RedisError as e:
+                print(f"Task stats seed failed: {e}")
+
+        total, completed = int(total), int(completed)
+        return TaskStats(
+            total=total, completed=completed, pending=total - completed
+        )
+
     @staticmethod
     async def get_all_tasks(db: AsyncSession) -> List[DBTask]:
         """Get all tasks."""
         return await TaskDAO.get_all_tasks(db)
 
     @staticmethod
-    async def get_task_by_id(task_id: int, db: AsyncSession) -> DBTask:
-        """Get task by ID."""
-        return await TaskDAO.get_task_by_id_or_raise(task_id, db)
+    async def get_tasks_page(
+        db: AsyncSession,
+        limit: int,
+        filters: TaskFilter,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Get one page of filtered task rows using keyset pagination on
+        (filters.order_by, id).
+        Returns the rows and the cursor for the next page, if any.
+        """
+        if (
+            filters.created_after is not None
+            and filters.created_before is not None
+            and filters.created_after >= filters.created_before
+        ):
+            raise TaskValidationException(
+                "created_after must be earlier than created_before"
+            )
+
+        after = decode_cursor(cursor) if cursor else None
+        # Fetch one extra row to find out whether another page exists
+        rows = await TaskDAO.get_tasks_page(db, limit + 1, filters, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            sort_value = getattr(last, filters.order_by.lstrip("-"))
+            next_cursor = encode_cursor(sort_value, last.id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    async def get_tasks_version(db: AsyncSession) -> int:
+        """
+        Cheap change marker for the task list, used to build list ETags
+        without loading rows: the sum of counter slots that Postgres
+        triggers bump in the same transaction as every write to tasks.
+        """
+        return await TaskDAO.get_tasks_version(db)
+
+    @staticmethod
+    async def search_tasks(
+        db: AsyncSession,
+        text: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Get one page of full-text search results, best match first.
+        Returns task rows with a `rank` column and the cursor for the next
+        page, if any.
+        """
+        after = decode_cursor(cursor, parse=float) if cursor else None
+        rows = await TaskDAO.search_tasks(db, text, limit + 1, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.rank, last.id)
+
+        return rows, next_cursor
+
+    @staticmethod
+    async def export_tasks(fmt: str, fetch_size: int) -> AsyncIterator[str]:
+        """
+        Stream every task as NDJSON or CSV text chunks.
+        Opens its own session, since a streaming response outlives the
+        request-scoped session from get_async_db.
+        """
+        serialize = rows_to_csv if fmt == "csv" else rows_to_ndjson
+        if fmt == "csv":
+            yield rows_to_csv([EXPORT_COLUMNS])
+
+        async with AsyncSessionLocal() as db:
+            async for rows in TaskDAO.stream_tasks(db, fetch_size):
+                yield serialize(rows)
+
+    @staticmethod
+    async def get_task_by_id(
+        task_id: int, db: AsyncSession, include_archived: bool = False
+    ) -> Task:
+        """
+        Get task by ID, reading through the Redis cache.
+        Falls back to the database if Redis is unavailable, and to
+        tasks_archive if include_archived is set.
+        """
+        try:
+            return await TaskService._get_live_task_by_id(task_id, db)
+        except TaskNotFoundException:
+            if not include_archived:
+                raise
+        return Task.model_validate(
+            await TaskDAO.get_archived_task_by_id_or_raise(task_id, db)
+        )
+
+    @staticmethod
+    async def _get_live_task_by_id(task_id: int, db: AsyncSession) -> Task:
+        key = task_cache_key(task_id)
+        version_key = task_version_key(task_id)
+        try:
+            cached, version = await get_redis().mget(key, version_key)
+            redis_ok = True
+        except RedisError as e:
+            print(f"Task cache read failed: {e}")
+            cached = version = None
+            redis_ok = False
+
+        if cached is not None:
+            task_cache_stats.hit()
+            return Task.model_validate_json(cached)
+
+        task_cache_stats.miss()
+        task = Task.model_validate(
+            await TaskDAO.get_task_by_id_or_raise(task_id, db)
+        )
+        if not redis_ok:
+            return task
+        try:
+            # Skipped if a write invalidated the task during the DB read
+            await get_redis().eval(
+                _FILL_TASK_SCRIPT,
+                2,
+                key,
+                version_key,
+                version or b"",
+                task.model_dump_json(),
+                settings.task_cache_ttl_seconds
+            )
+        except RedisError as e:
+            print(f"Task cache write failed: {e}")
+        return task
 
     @staticmethod
     async def create_task(task_data: TaskCreate, db: AsyncSession) -> DBTask:
@@ -29,13 +274,20 @@ class TaskService:
         if not task_data.title or len(task_data.title.strip()) == 0:
             raise TaskValidationException("Title cannot be empty")
 
-        new_task = DBTask(
-            title=task_data.title.strip(),
-            description=task_data.description,
-            completed=task_data.completed
+        task = await TaskDAO.create_task(
+            {
+                "title": task_data.title.strip(),
+                "description": task_data.description,
+                "completed": task_data.completed
+            },
+            db
         )
-
-        return await TaskDAO.create_task(new_task, db)
+        await TaskService._invalidate_cached_tasks(task.id)
+        await TaskService._adjust_stats(
+            total=1, completed=int(bool(task.completed))
+        )
+        await task_change_feed.publish("created", [task.id])
+        return task
 
     @staticmethod
     async def update_task(
@@ -44,24 +296,152 @@ class TaskService:
         db: AsyncSession
     ) -> DBTask:
         """Update an existing task."""
-        task = await TaskDAO.get_task_by_id_or_raise(task_id, db)
+        values = {}
 
         # Update only provided fields
         if task_data.title is not None:
             if len(task_data.title.strip()) == 0:
                 raise TaskValidationException("Title cannot be empty")
-            task.title = task_data.title.strip()
+            values["title"] = task_data.title.strip()
 
         if task_data.description is not None:
-            task.description = task_data.description
+            values["description"] = task_data.description
 
         if task_data.completed is not None:
-            task.completed = task_data.completed
+            values["completed"] = task_data.completed
+
+        if not values:
+            return await TaskDAO.get_task_by_id_or_raise(task_id, db)
+
+        task, previous_completed = await TaskDAO.update_task(
+            task_id, values, db
+        )
+        await TaskService._invalidate_cached_tasks(task_id)
+        await TaskService._adjust_stats(
+            completed=int(bool(task.completed)) - int(bool(previous_completed))
+        )
+        await task_change_feed.publish("updated", [task_id])
+        return task
+
+    @staticmethod
+    def _check_bulk_size(count: int) -> None:
+        if count > settings.task_bulk_max_items:
+            raise TaskValidationException(
+                f"At most {settings.task_bulk_max_items} items per request"
+            )
+
+    @staticmethod
+    async def bulk_create_tasks(
+        items: List[TaskCreate], db: AsyncSession
+    ) -> Tuple[List[DBTask], List[BulkItemError]]:
+        """Create many tasks in one transaction, skipping invalid items."""
+        TaskService._check_bulk_size(len(items))
+
+        rows, errors = [], []
+        for index, item in enumerate(items):
+            if not item.title or len(item.title.strip()) == 0:
+                errors.append(
+                    BulkItemError(index=index, detail="Title cannot be empty")
+                )
+                continue
+            rows.append({
+                "title": item.title.strip(),
+                "description": item.description,
+                "completed": item.completed
+            })
 
-        return await TaskDAO.update_task(task, db)
+        created = await TaskDAO.bulk_create_tasks(rows, db) if rows else []
+        await TaskService._adjust_stats(
+            total=len(created),
+            completed=sum(bool(task.completed) for task in created)
+        )
+        await task_change_feed.publish(
+            "created", [task.id for task in created]
+        )
+        return created, errors
+
+    @staticmethod
+    async def bulk_update_tasks(
+        items: List[TaskBulkUpdateItem], db: AsyncSession
+    ) -> Tuple[List[DBTask], List[BulkItemError]]:
+        """Update many tasks in one transaction, skipping invalid items."""
+        TaskService._check_bulk_size(len(items))
+
+        rows, errors, indexes = [], [], {}
+        for index, item in enumerate(items):
+            if item.id in indexes:
+                errors.append(
+                    BulkItemError(index=index, detail="Duplicate task ID")
+                )
+                continue
+            title = item.title
+            if title is not None:
+                title = title.strip()
+                if len(title) == 0:
+                    errors.append(BulkItemError(
+                        index=index, detail="Title cannot be empty"
+                    ))
+                    continue
+            indexes[item.id] = index
+            rows.append((item.id, title, item.description, item.completed))
+
+        updated = await TaskDAO.bulk_update_tasks(rows, db) if rows else []
+        tasks = [task for task, _ in updated]
+        await TaskService._invalidate_cached_tasks(
+            *(task.id for task in tasks)
+        )
+        await TaskService._adjust_stats(completed=sum(
+            int(bool(task.completed)) - int(bool(previous_completed))
+            for task, previous_completed in updated
+        ))
+        await task_change_feed.publish(
+            "updated", [task.id for task in tasks]
+        )
+
+        found = {task.id for task in tasks}
+        for task_id, index in indexes.items():
+            if task_id not in found:
+                errors.append(BulkItemError(
+                    index=index, detail=str(TaskNotFoundException(task_id))
+                ))
+        return tasks, errors
+
+    @staticmethod
+    async def bulk_delete_tasks(
+        task_ids: List[int], db: AsyncSession
+    ) -> Tuple[List[int], List[BulkItemError]]:
+        """Delete many tasks in one transaction."""
+        TaskService._check_bulk_size(len(task_ids))
+
+        deleted = (
+            await TaskDAO.bulk_delete_tasks(list(set(task_ids)), db)
+            if task_ids else []
+        )
+        deleted_ids = [task_id for task_id, _ in deleted]
+        await TaskService._invalidate_cached_tasks(*deleted_ids)
+        await TaskService._adjust_stats(
+            total=-len(deleted),
+            completed=-sum(bool(completed) for _, completed in deleted)
+        )
+        await task_change_feed.publish("deleted", deleted_ids)
+
+        found = set(deleted_ids)
+        errors = [
+            BulkItemError(
+                index=index, detail=str(TaskNotFoundException(task_id))
+            )
+            for index, task_id in enumerate(task_ids)
+            if task_id not in found
+        ]
+        return deleted_ids, errors
 
     @staticmethod
     async def delete_task(task_id: int, db: AsyncSession) -> bool:
         """Delete a task."""
-        task = await TaskDAO.get_task_by_id_or_raise(task_id, db)
-        return await TaskDAO.delete_task(task, db) 
\ No newline at end of file
+        completed = await TaskDAO.delete_task(task_id, db)
+        await TaskService._invalidate_cached_tasks(task_id)
+        await TaskService._adjust_stats(
+            total=-1, completed=-int(bool(completed))
+        )
+        await task_change_feed.publish("deleted", [task_id])
+        return True 
\ No newline at end of file
@@ -0,0 +1,129 @@
+import base64
+import binascii
+import csv
+import hashlib
+import io
+import json
+import math
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple, Union
+
+from tasks.exceptions import InvalidCursorException
+
+
+def task_cache_key(task_id: int) -> str:
+    """Redis key holding the cached copy of a single task."""
+    return f"task:{task_id}"
+
+
+def task_version_key(task_id: int) -> str:
+    """
+    Redis counter bumped whenever a task's cached copy is invalidated; a
+    read-through fill only stores its copy if the counter is unchanged.
+    """
+    return f"task:{task_id}:version"
+
+
+def queue_task_invalidation(
+    pipe: Any, task_ids: Sequence[int], version_ttl: int
+) -> None:
+    """
+    Queue dropping the cached tasks and bumping their versions on a Redis
+    pipeline (sync or async). `version_ttl` must outlast any in-flight
+    fill, so it is at least the cache TTL.
+    """
+    for task_id in task_ids:
+        pipe.incr(task_version_key(task_id))
+        pipe.expire(task_version_key(task_id), version_ttl)
+    pipe.delete(*(task_cache_key(task_id) for task_id in task_ids))
+
+
+TASK_STATS_TOTAL_KEY = "task_stats:total"
+TASK_STATS_COMPLETED_KEY = "task_stats:completed"
+
+EXPORT_COLUMNS = (
+    "id", "title", "description", "completed", "created_at", "updated_at"
+)
+
+
+def encode_cursor(sort_value: Union[datetime, float], task_id: int) -> str:
+    """Encode a (sort value, id) keyset position as an opaque cursor."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = f"{sort_value}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    parse: Callable[[str], Any] = datetime.fromisoformat
+) -> Tuple[Any, int]:
+    """
+    Decode an opaque cursor back into a (sort value, id) keyset position.
+    `parse` converts the sort value (datetime by default, float for ranks).
+    Raises InvalidCursorException if the cursor is malformed or holds a
+    value the query could not bind (aware datetime, non-finite rank, id
+    outside the INTEGER range).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_value, raw_id = (
+            base64.urlsafe_b64decode(padded).decode().split("|")
+        )
+        sort_value, task_id = parse(raw_value), int(raw_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise InvalidCursorException()
+
+    if isinstance(sort_value, datetime):
+        if sort_value.tzinfo is not None:
+            raise InvalidCursorException()
+    elif not math.isfinite(sort_value):
+        raise InvalidCursorException()
+    if not -2**31 <= task_id < 2**31:
+        raise InvalidCursorException()
+    return sort_value, task_id
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the given version markers."""
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def rows_to_ndjson(rows: Iterable[Sequence[Any]]) -> str:
+    """Serialize task rows (in EXPORT_COLUMNS order) as NDJSON lines."""
+    return "".join(
+        json.dumps(
+            {col: _export_value(val) for col, val in zip(EXPORT_COLUMNS, row)}
+        ) + "\n"
+        for row in rows
+    )
+
+
+def rows_to_csv(rows: Iterable[Sequence[Any]]) -> str:
+    """Serialize task rows (in EXPORT_COLUMNS order) as CSV lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(val) for val in row] for row in rows)
+    return buffer.getvalue()
@@ -0,0 +1,48 @@
+import sys
+
+from fastapi.testclient import TestClient
+
+
+def test_app_imports_modules_from_a_single_root():
+    import main  # noqa: F401
+
+    # A second `src.`-prefixed copy would hold its own Redis client, caches
+    # and pools that /metrics and the lifespan hook never see
+    assert not [name for name in sys.modules if name.startswith("src.")]
+
+
+def test_metrics_lists_every_cache():
+    from main import app
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    for cache in ("task", "user", "jwt", "chat", "chat_semantic"):
+        assert f'cache_hits_total{{cache="{cache}"}}' in response.text
+
+
+def test_assistant_registry_is_bounded():
+    from assitant import AssistantRegistry
+
+    registry = AssistantRegistry(max_assistants=2)
+    first = registry.get(model_name="model-a")
+    for name in ("model-b", "model-c", "model-d"):
+        registry.get(model_name=name)
+
+    assert len(registry._assistants) == 2
+    assert len(registry._clients) == 1
+    assert registry.get(model_name="model-a") is not first
+
+
+def test_routers_are_mounted_at_their_own_prefix():
+    from main import app
+
+    client = TestClient(app)
+
+    # Neither request reaches the database: the form and the query are
+    # rejected first, so anything but 404 means the route resolved
+    assert client.post("/auth/token").status_code == 422
+    assert client.get("/auth/me").status_code == 401
+    assert client.get("/tasks/", params={"limit": 0}).status_code == 422
+    assert client.get("/auth/auth/token").status_code == 404
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+import auth.api
+import auth.utils
+from auth.crud import UserDAO
+from auth.execptions import (InvalidTokenException,
+                             PasswordHashingBusyException,
+                             TokenExpiredException,
+                             TokenStoreUnavailableException)
+from auth.service import AuthService, _user_refresh_tokens_key
+from auth.utils import (create_access_token, create_refresh_token,
+                        decode_access_token, decode_refresh_token,
+                        get_password_hash_when_idle, token_cache_stats,
+                        verify_password_async)
+from config import settings
+from database import get_async_db
+
+
+def test_tokens_without_redis_are_access_only(fake_redis):
+    fake_redis.down = True
+
+    tokens = asyncio.run(AuthService._issue_tokens("user@example.com"))
+
+    assert tokens["access_token"]
+    assert tokens["refresh_token"] is None
+
+
+def test_refresh_without_redis_is_unavailable(fake_redis):
+    fake_redis.down = True
+    refresh_token, _, _ = create_refresh_token("user@example.com")
+
+    with pytest.raises(TokenStoreUnavailableException):
+        asyncio.run(AuthService.refresh_tokens(refresh_token))
+
+
+def test_rehash_waits_for_an_idle_hashing_worker(monkeypatch):
+    # Logins may still queue here; background rehashes may not
+    monkeypatch.setattr(
+        auth.utils, "_hash_in_flight", settings.password_hash_workers
+    )
+
+    with pytest.raises(PasswordHashingBusyException):
+        asyncio.run(get_password_hash_when_idle("password"))
+
+
+def test_hashing_beyond_pool_capacity_is_rejected(monkeypatch):
+    monkeypatch.setattr(
+        auth.utils, "_hash_in_flight",
+        settings.password_hash_workers + settings.password_hash_queue_depth
+    )
+
+    with pytest.raises(PasswordHashingBusyException):
+        asyncio.run(verify_password_async("password", "hash"))
+
+
+def test_cancelled_caller_holds_its_slot_until_the_job_ends(monkeypatch):
+    release = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(auth.utils, "_get_hash_executor", lambda: executor)
+
+    async def run():
+        caller = asyncio.create_task(
+            auth.utils._run_hash_job(release.wait, capacity=1)
+        )
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        # The bcrypt call is still running, so the slot stays taken
+        with pytest.raises(PasswordHashingBusyException):
+            await auth.utils._run_hash_job(time.time, capacity=1)
+        return auth.utils._hash_in_flight
+
+    try:
+        assert asyncio.run(run()) == 1
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+    assert auth.utils._hash_in_flight == 0
+
+
+def test_saturated_hashing_pool_returns_503_with_retry_after(monkeypatch):
+    import main
+
+    async def no_limit(ip, email):
+        pass
+
+    async def get_user(email, db):
+        return SimpleNamespace(hashed_password="hash")
+
+    monkeypatch.setattr(auth.api, "enforce_login_rate_limit", no_limit)
+    monkeypatch.setattr(UserDAO, "get_user_by_email", get_user)
+    monkeypatch.setattr(
+        auth.utils, "_hash_in_flight",
+        settings.password_hash_workers + settings.password_hash_queue_depth
+    )
+    monkeypatch.setitem(
+        main.app.dependency_overrides, get_async_db, lambda: None
+    )
+
+    response = TestClient(main.app).post(
+        "/auth/token",
+        data={"username": "user@example.com", "password": "password"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_revoking_without_redis_does_not_fail(fake_redis):
+    fake_redis.down = True
+
+    asyncio.run(AuthService.revoke_refresh_tokens("user@example.com"))
+
+
+def test_issuing_prunes_expired_token_ids(fake_redis):
+    user_key = _user_refresh_tokens_key("user@example.com")
+    fake_redis.sorted_sets[user_key] = {
+        b"expired": time.time() - 1, b"live": time.time() + 60
+    }
+
+    tokens = asyncio.run(AuthService._issue_tokens("user@example.com"))
+
+    _, jti = decode_refresh_token(tokens["refresh_token"])
+    assert set(fake_redis.sorted_sets[user_key]) == {b"live", jti.encode()}
+
+
+def test_cached_token_is_rejected_after_its_exp(monkeypatch):
+    token = create_access_token(
+        {"sub": "cached@example.com"}, expires_delta=timedelta(seconds=60)
+    )
+    assert decode_access_token(token) == "cached@example.com"
+    hits = token_cache_stats.hits
+    assert decode_access_token(token) == "cached@example.com"
+    assert token_cache_stats.hits == hits + 1
+
+    # The cache entry itself is still live (its TTL runs on the monotonic
+    # clock); only the token's own exp has passed
+    now = time.time()
+    monkeypatch.setattr(auth.utils.time, "time", lambda: now + 120)
+
+    with pytest.raises(TokenExpiredException):
+        decode_access_token(token)
+
+
+def test_refresh_token_is_not_an_access_token():
+    refresh_token, _, _ = create_refresh_token("user@example.com")
+
+    with pytest.raises(InvalidTokenException):
+        decode_access_token(refresh_token)
+
+
+def test_token_without_exp_is_rejected():
+    token = jwt.encode(
+        {"sub": "user@example.com"}, settings.secret_key,
+        algorithm=settings.algorithm
+    )
+
+    with pytest.raises(InvalidTokenException):
+        decode_access_token(token)
+
+
+def _expires_in(token):
+    return jwt.get_unverified_claims(token)["exp"] - time.time()
+
+
+def test_refresh_rotation_rejects_reuse_and_survives_redis_outage(
+    fake_redis
+):
+    first = asyncio.run(AuthService._issue_tokens("user@example.com"))
+    second = asyncio.run(AuthService.refresh_tokens(first["refresh_token"]))
+
+    # Login and refresh issue access tokens with the same lifetime
+    lifetime = settings.access_token_expire_minutes * 60
+    for tokens in (first, second):
+        assert abs(_expires_in(tokens["access_token"]) - lifetime) < 5
+
+    # A rotated refresh token cannot be redeemed again
+    with pytest.raises(InvalidTokenException):
+        asyncio.run(AuthService.refresh_tokens(first["refresh_token"]))
+
+    # While Redis is down refreshing fails without consuming the token,
+    # and logins fall back to access-only tokens
+    fake_redis.down = True
+    with pytest.raises(TokenStoreUnavailableException):
+        asyncio.run(AuthService.refresh_tokens(second["refresh_token"]))
+    fallback = asyncio.run(AuthService._issue_tokens("user@example.com"))
+    assert fallback["refresh_token"] is None
+    assert abs(_expires_in(fallback["access_token"]) - lifetime) < 5
+
+    fake_redis.down = False
+    third = asyncio.run(AuthService.refresh_tokens(second["refresh_token"]))
+    assert third["refresh_token"]
@@ -0,0 +1,72 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+class _StubAssistant:
+    model_name = "stub-model"
+
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+        self.calls = []
+
+    async def stream_chat_response(self, messages, **params):
+        self.calls.append((messages, params))
+        for delta in self.deltas:
+            yield delta
+        if self.error is not None:
+            raise self.error
+
+
+def _stream(monkeypatch, assistant, **body):
+    monkeypatch.setattr(
+        main, "get_assistant", lambda assistant_type, model_name=None: assistant
+    )
+    client = TestClient(main.app)
+    # cache=False keeps the response cache (and Redis) out of the request
+    response = client.post(
+        "/api/chat/stream", json={"message": "hi", "cache": False, **body}
+    )
+
+    events = []
+    for block in response.text.split("\n\n"):
+        if block:
+            event, data = block.split("\n")
+            events.append((
+                event.removeprefix("event: "),
+                json.loads(data.removeprefix("data: "))
+            ))
+    return response, events
+
+
+def test_stream_sends_tokens_then_done(monkeypatch):
+    assistant = _StubAssistant(["Hel", "lo"])
+
+    response, events = _stream(monkeypatch, assistant, temperature=0.5)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert events[:2] == [("token", {"text": "Hel"}), ("token", {"text": "lo"})]
+    done, timings = events[2]
+    assert done == "done"
+    assert timings["cached"] is False
+    assert timings["ttft_ms"] <= timings["total_ms"]
+    assert len(events) == 3
+    assert assistant.calls == [
+        ([{"role": "user", "content": "hi"}], {"temperature": 0.5})
+    ]
+
+
+def test_stream_failure_mid_reply_sends_error_instead_of_done(monkeypatch):
+    assistant = _StubAssistant(["partial"], error=RuntimeError("upstream"))
+
+    response, events = _stream(monkeypatch, assistant)
+
+    assert response.status_code == 200
+    assert events == [
+        ("token", {"text": "partial"}),
+        ("error", {"detail": "An internal error occurred."})
+    ]
@@ -0,0 +1,37 @@
+from auth.email_filter import EMAIL_BLOOM_KEY, add_emails_sync, bloom_positions
+
+
+class _Pipeline:
+    def __init__(self):
+        self.commands = []
+        self.executed = False
+
+    def execute_command(self, *args):
+        self.commands.append(args)
+
+    def execute(self):
+        self.executed = True
+
+
+class _Redis:
+    def __init__(self):
+        self.pipe = _Pipeline()
+
+    def pipeline(self, transaction=True):
+        return self.pipe
+
+
+def test_add_emails_sync_sets_every_bloom_bit_in_one_round_trip():
+    client = _Redis()
+
+    added = add_emails_sync(client, ["a@example.com", "b@example.com"])
+
+    assert added == 2
+    assert client.pipe.executed
+    for command, email in zip(client.pipe.commands,
+                              ["a@example.com", "b@example.com"]):
+        assert command[:2] == ("BITFIELD", EMAIL_BLOOM_KEY)
+        assert command[2:] == tuple(
+            arg for position in bloom_positions(email)
+            for arg in ("SET", "u1", position, 1)
+        )
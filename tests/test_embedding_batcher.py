@@ -0,0 +1,31 @@
+import asyncio
+import gc
+
+from assitant.batching import EmbeddingBatcher
+
+
+def test_batcher_keeps_in_flight_sends_alive():
+    async def run():
+        release = asyncio.Event()
+        calls = []
+
+        async def batch_fn(texts, model):
+            calls.append(texts)
+            await release.wait()
+            return [[float(len(text))] for text in texts]
+
+        batcher = EmbeddingBatcher(batch_fn, max_batch=2, max_wait=1)
+        results = asyncio.gather(
+            batcher.embed("a", "m"), batcher.embed("bb", "m")
+        )
+        await asyncio.sleep(0)
+        assert len(batcher._sends) == 1
+
+        gc.collect()
+        release.set()
+        assert await results == [[1.0], [2.0]]
+        await asyncio.sleep(0)
+        assert not batcher._sends
+        assert calls == [["a", "bb"]]
+
+    asyncio.run(run())
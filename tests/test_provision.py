@@ -0,0 +1,20 @@
+from auth.provision import read_records
+
+
+def test_malformed_ndjson_lines_are_yielded_as_invalid(tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        '{"email": "a@example.com", "password": "secret"}\n'
+        '{"email": "b@example.com", "passw\n'
+        "[]\n"
+        "\n"
+        '"text"\n'
+        '{"email": "c@example.com", "password": "secret"}\n',
+        encoding="utf-8"
+    )
+
+    records = list(read_records(str(path), "ndjson"))
+
+    assert [r and r["email"] for r in records] == [
+        "a@example.com", None, None, None, "c@example.com"
+    ]
@@ -0,0 +1,26 @@
+from auth.rate_limit import client_ip
+from config import settings
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers(monkeypatch):
+    monkeypatch.setattr(settings, "trusted_proxies", "10.0.0.0/8")
+
+    assert client_ip("203.0.113.7", "198.51.100.1") == "203.0.113.7"
+
+
+def test_trusted_proxy_uses_right_most_untrusted_hop(monkeypatch):
+    monkeypatch.setattr(settings, "trusted_proxies", "10.0.0.0/8, 127.0.0.1")
+
+    # The left-most entry is whatever the client sent; only the hop the
+    # proxy appended (and proxies after it) can be trusted
+    assert client_ip("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.5") == (
+        "198.51.100.1"
+    )
+    assert client_ip("127.0.0.1", "198.51.100.9") == "198.51.100.9"
+    assert client_ip("10.0.0.2", None) == "10.0.0.2"
+
+
+def test_no_trusted_proxies_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "trusted_proxies", "")
+
+    assert client_ip("10.0.0.2", "198.51.100.1") == "10.0.0.2"
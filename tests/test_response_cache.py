@@ -0,0 +1,117 @@
+import asyncio
+import zlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from assitant.openai import OpenAIAssistant
+from assitant.response_cache import (chat_cache_key, get_cached_response,
+                                     should_cache, store_response)
+from config import settings
+
+
+class _Completions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f" reply {self.calls} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _chat(monkeypatch, bodies):
+    completions = _Completions()
+    assistant = OpenAIAssistant(
+        model_name="stub-model",
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+    monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+    monkeypatch.setattr(
+        main, "get_assistant", lambda assistant_type, model_name=None: assistant
+    )
+
+    client = TestClient(main.app)
+    responses = [
+        client.post("/api/chat", json={"message": "hi", **body})
+        for body in bodies
+    ]
+    return responses, completions.calls
+
+
+def test_only_temperature_zero_is_cached_by_default():
+    assert should_cache({"temperature": 0})
+    assert not should_cache({"temperature": 0.7})
+    assert not should_cache({})
+    assert should_cache({"temperature": 0.7}, opt_in=True)
+    assert not should_cache({"temperature": 0}, opt_in=False)
+
+
+def test_stored_response_round_trips_through_zlib(fake_redis):
+    text = "Bonjour, ça va? " * 50
+
+    async def run():
+        await store_response("chat_cache:key", text)
+        return await get_cached_response("chat_cache:key")
+
+    assert asyncio.run(run()) == text
+    stored = fake_redis.data["chat_cache:key"]
+    assert len(stored) < len(text.encode())
+    assert zlib.decompress(stored).decode() == text
+
+
+def test_repeated_request_is_served_from_cache(fake_redis, monkeypatch):
+    responses, calls = _chat(
+        monkeypatch, [{"temperature": 0}, {"temperature": 0}]
+    )
+
+    miss, hit = responses
+    assert miss.headers["X-Cache"] == "MISS"
+    assert miss.json() == {"response": "reply 1", "cached": False}
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.json() == {"response": "reply 1", "cached": True}
+    assert calls == 1
+
+
+def test_sampled_requests_skip_the_cache(fake_redis, monkeypatch):
+    responses, calls = _chat(
+        monkeypatch, [{"temperature": 0.7}, {"temperature": 0.7}]
+    )
+
+    assert [r.headers["X-Cache"] for r in responses] == ["MISS", "MISS"]
+    assert calls == 2
+
+
+def test_redis_errors_fall_through_to_a_live_call(fake_redis, monkeypatch):
+    fake_redis.down = True
+
+    responses, calls = _chat(
+        monkeypatch, [{"temperature": 0}, {"temperature": 0}]
+    )
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert [r.json() for r in responses] == [
+        {"response": "reply 1", "cached": False},
+        {"response": "reply 2", "cached": False}
+    ]
+    assert calls == 2
+
+
+@pytest.mark.parametrize("value", [b"not zlib", zlib.compress(b"\xff\xfe")])
+def test_unreadable_entry_falls_through_to_a_live_call(
+    fake_redis, monkeypatch, value
+):
+    # ChatRequest parses temperature as a float, so the key holds 0.0
+    key = chat_cache_key("stub-model", [{"role": "user", "content": "hi"}],
+                         {"temperature": 0.0})
+    fake_redis.data[key] = value
+
+    responses, calls = _chat(monkeypatch, [{"temperature": 0}])
+
+    assert responses[0].status_code == 200
+    assert responses[0].json() == {"response": "reply 1", "cached": False}
+    assert calls == 1
+    # The live reply replaced the unreadable entry
+    assert zlib.decompress(fake_redis.data[key]) == b"reply 1"
@@ -0,0 +1,142 @@
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+from assitant.semantic_cache import SemanticCache
+
+
+def _cache(path, capacity=3):
+    return SemanticCache(capacity=capacity, threshold=0.9, path=str(path))
+
+
+def test_lookup_returns_closest_answer_in_scope():
+    cache = _cache("unused")
+    cache._loaded = True
+    cache.add("a", [1, 0, 0], "x")
+    cache.add("a", [0, 1, 0], "y")
+    cache.add("b", [0, 0, 1], "z")
+
+    assert cache.lookup("a", [0.99, 0.05, 0]) == "x"
+    assert cache.lookup("b", [1, 0, 0]) is None
+
+
+def test_full_cache_evicts_least_recently_used():
+    cache = _cache("unused")
+    cache._loaded = True
+    cache.add("a", [1, 0, 0], "x")
+    cache.add("a", [0, 1, 0], "y")
+    cache.add("a", [0, 0, 1], "z")
+    cache.lookup("a", [1, 0, 0])
+
+    cache.add("a", [0, 0.7, 0.7], "w")
+
+    assert sorted(r for r in cache._responses if r) == ["w", "x", "z"]
+
+
+def test_save_and_reload_round_trip(tmp_path):
+    path = tmp_path / "index"
+    cache = _cache(path)
+    cache.add("a", [1, 0, 0], "x")
+    cache.add("a", [0, 1, 0], "y")
+    cache.save()
+    cache.add("a", [0, 0, 1], "z")
+    cache.save()
+
+    reloaded = _cache(path)
+    assert reloaded.lookup("a", [0, 0, 1]) == "z"
+    assert len(reloaded) == 3
+    # Superseded vector files are cleaned up
+    assert len(list(tmp_path.glob("index.*.npy"))) == 1
+
+
+def test_mismatched_index_loads_as_cold_cache(tmp_path):
+    path = tmp_path / "index"
+    cache = _cache(path)
+    cache.add("a", [1, 0, 0], "x")
+    cache.add("a", [0, 1, 0], "y")
+    cache.save()
+
+    manifest = json.loads((tmp_path / "index.json").read_text())
+    np.save(tmp_path / manifest["vectors"], np.zeros((1, 3), np.float32))
+
+    reloaded = _cache(path)
+    assert reloaded.lookup("a", [1, 0, 0]) is None
+    assert len(reloaded) == 0
+    reloaded.add("a", [1, 0, 0], "fresh")
+    assert reloaded.lookup("a", [1, 0, 0]) == "fresh"
+
+
+def test_corrupt_manifest_loads_as_cold_cache(tmp_path):
+    (tmp_path / "index.json").write_text("{not json")
+
+    assert _cache(tmp_path / "index").lookup("a", [1, 0, 0]) is None
+
+
+def _save_worker(path, worker):
+    cache = _cache(path, capacity=200)
+    rng = np.random.default_rng(worker)
+    for i in range(200):
+        cache.add("a", rng.random(64).tolist(), f"{worker}-{i}")
+    for _ in range(5):
+        cache.save()
+
+
+def test_concurrent_saves_leave_a_consistent_index(tmp_path):
+    path = str(tmp_path / "index")
+    workers = [
+        multiprocessing.Process(target=_save_worker, args=(path, worker))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    reloaded = _cache(path, capacity=200)
+    reloaded._ensure_loaded()
+    assert len(reloaded) == 200
+    owners = {response.split("-")[0]
+              for response in reloaded._responses if response}
+    assert len(owners) == 1
+    assert not [name for name in os.listdir(tmp_path) if ".tmp" in name]
+
+
+def test_reloaded_index_stays_mapped_with_new_entries_in_an_overlay(tmp_path):
+    path = tmp_path / "index"
+    cache = _cache(path)
+    cache.add("a", [1, 0, 0], "x")
+    cache.add("a", [0, 1, 0], "y")
+    cache.save()
+
+    reloaded = _cache(path)
+    reloaded.lookup("a", [0, 1, 0])
+    reloaded.add("a", [0, 0, 1], "z")
+    # Full: the least recently used saved entry is masked out, not copied
+    reloaded.add("a", [0.7, 0.7, 0], "w")
+
+    assert isinstance(reloaded._base, np.memmap)
+    assert not reloaded._base.flags.writeable
+    probes = ([1, 0, 0], [0, 1, 0], [0, 0, 1], [0.7, 0.7, 0])
+    assert [reloaded.lookup("a", v) for v in probes] == [None, "y", "z", "w"]
+    assert len(reloaded) == 3
+
+    reloaded.save()
+    again = _cache(path)
+    again._ensure_loaded()
+    assert sorted(r for r in again._responses if r) == ["w", "y", "z"]
+
+
+def test_index_is_saved_every_n_inserts(tmp_path):
+    path = tmp_path / "index"
+    cache = SemanticCache(
+        capacity=10, threshold=0.9, path=str(path), save_every=2
+    )
+    cache.add("a", [1, 0, 0], "x")
+    assert not (tmp_path / "index.json").exists()
+    cache.add("a", [0, 1, 0], "y")
+
+    # Persisted without a shutdown save, e.g. for a worker that crashes
+    assert _cache(path).lookup("a", [0, 1, 0]) == "y"
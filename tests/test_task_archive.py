@@ -0,0 +1,76 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config import settings
+from tasks.background_tasks import (ARCHIVE_BATCH_SQL,
+                                    _ensure_archive_partitions)
+from tasks.crud import TaskDAO
+from tasks.models import TaskFilter
+
+OLD = settings.task_archive_after_days + 10
+
+
+def test_archive_batch_moves_old_completed_tasks(
+    migrated_schema, run_in_migrated_schema
+):
+    with Session(migrated_schema) as db:
+        ids = db.execute(text(f"""
+            INSERT INTO tasks (title, completed, created_at, updated_at)
+            VALUES ('old done', true, now() - interval '{OLD} days',
+                    now() - interval '{OLD} days'),
+                   ('recent done', true, now(), now()),
+                   ('old open', false, now() - interval '{OLD} days',
+                    now() - interval '{OLD} days')
+            RETURNING id
+        """)).scalars().all()
+        db.commit()
+
+        _ensure_archive_partitions(db)
+        # Idempotent: the job runs it on every invocation
+        _ensure_archive_partitions(db)
+        bounds = db.execute(text("""
+            SELECT pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'tasks_archive'::regclass
+            ORDER BY 1
+        """)).scalars().all()
+        this_month, next_month = db.execute(text("""
+            SELECT to_char(date_trunc('month', now()), 'YYYY-MM-DD'),
+                   to_char(date_trunc('month', now()) + interval '1 month',
+                           'YYYY-MM-DD')
+        """)).one()
+
+        archived = db.execute(
+            ARCHIVE_BATCH_SQL,
+            {"days": settings.task_archive_after_days, "batch_size": 10}
+        ).scalars().all()
+        db.commit()
+
+    assert len(bounds) == 2
+    assert f"FROM ('{this_month} 00:00:00') TO ('{next_month}" in bounds[0]
+    assert archived == [ids[0]]
+
+    async def read(db):
+        live = await TaskDAO.get_tasks_page(db, 10, TaskFilter())
+        everything = await TaskDAO.get_tasks_page(
+            db, 10, TaskFilter(include_archived=True, order_by="-updated_at")
+        )
+        open_only = await TaskDAO.get_tasks_page(
+            db, 10, TaskFilter(include_archived=True, completed=False)
+        )
+        archived_task = await TaskDAO.get_archived_task_by_id_or_raise(
+            ids[0], db
+        )
+        return (
+            [row.id for row in live],
+            [row.id for row in everything],
+            [row.id for row in open_only],
+            archived_task.title
+        )
+
+    live, everything, open_only, title = run_in_migrated_schema(read)
+    assert sorted(live) == sorted(ids[1:])
+    # Ties on updated_at are broken by id, across both tables
+    assert everything == [ids[1], ids[2], ids[0]]
+    assert open_only == [ids[2]]
+    assert title == "old done"
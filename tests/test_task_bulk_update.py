@@ -0,0 +1,97 @@
+import asyncio
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from tasks.crud import TaskDAO
+from tasks.schema import Task
+
+
+class _CapturingSession:
+    """Records the statement instead of running it."""
+    def __init__(self):
+        self.statement = None
+
+    async def execute(self, statement):
+        self.statement = statement
+        raise RuntimeError("not executed")
+
+    async def rollback(self):
+        pass
+
+
+def _compiled_bulk_update(rows):
+    db = _CapturingSession()
+    try:
+        asyncio.run(TaskDAO.bulk_update_tasks(rows, db))
+    except Exception:
+        pass
+    return db.statement.compile(dialect=asyncpg.dialect())
+
+
+def test_bulk_update_parameter_count_is_independent_of_batch_size():
+    rows = [(i, f"title {i}", None, None) for i in range(10000)]
+    compiled = _compiled_bulk_update(rows)
+
+    # One array per column, well under asyncpg's 32767-parameter limit
+    assert sorted(compiled.positiontup) == [
+        "completed", "descriptions", "ids", "titles"
+    ]
+    assert len(compiled.params["ids"]) == 10000
+
+
+def test_bulk_update_arrays_are_explicitly_typed():
+    compiled = _compiled_bulk_update([(1, "renamed", None, None)])
+    sql = str(compiled)
+
+    assert "AS BOOLEAN[]" in sql
+    assert "AS INTEGER[]" in sql
+    assert sql.count("AS VARCHAR[]") == 2
+
+
+def test_bulk_update_rename_only_batch_keeps_completed(run_with_tasks_table):
+    async def scenario(db):
+        db.add_all([
+            Task(title="a", completed=True),
+            Task(title="b", completed=False),
+        ])
+        await db.commit()
+        tasks = (await db.execute(Task.__table__.select())).all()
+        rows = [(task.id, f"{task.title}-renamed", None, None)
+                for task in tasks]
+
+        updated = await TaskDAO.bulk_update_tasks(rows, db)
+        return {task.title: (task.completed, previous)
+                for task, previous in updated}
+
+    assert run_with_tasks_table(scenario) == {
+        "a-renamed": (True, True),
+        "b-renamed": (False, False),
+    }
+
+
+def test_bulk_update_accepts_max_batch_size(run_with_tasks_table):
+    async def scenario(db):
+        db.add_all([Task(title=str(i)) for i in range(10000)])
+        await db.commit()
+        ids = (await db.execute(Task.__table__.select())).scalars().all()
+
+        updated = await TaskDAO.bulk_update_tasks(
+            [(task_id, None, None, True) for task_id in ids], db
+        )
+        return len(updated), all(task.completed for task, _ in updated)
+
+    assert run_with_tasks_table(scenario) == (10000, True)
+
+
+def test_bulk_create_returns_tasks_in_input_order(run_with_tasks_table):
+    # More rows than one insertmanyvalues page, in an order ids would not
+    # reproduce if pages or rows came back shuffled
+    titles = [f"task {i}" for i in reversed(range(2500))]
+
+    async def scenario(db):
+        created = await TaskDAO.bulk_create_tasks(
+            [{"title": title} for title in titles], db
+        )
+        return [task.title for task in created]
+
+    assert run_with_tasks_table(scenario) == titles
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from tasks.crud import TaskDAO
+from tasks.service import _FILL_TASK_SCRIPT, TaskService
+from tasks.utils import task_cache_key
+
+
+def _fill_task(redis):
+    """_FILL_TASK_SCRIPT, run on the fake's data."""
+    def fill(keys, args):
+        key, version_key = keys
+        seen, value, ttl = args
+        if redis.data.get(version_key, b"") == seen:
+            redis.data[key] = value.encode()
+            return 1
+        return 0
+
+    return fill
+
+
+def _row(title):
+    now = datetime(2026, 1, 1)
+    return SimpleNamespace(
+        id=1, title=title, description=None, completed=False,
+        created_at=now, updated_at=now
+    )
+
+
+def _read_with_concurrent_write(redis, monkeypatch, write_during_read):
+    redis.scripts[_FILL_TASK_SCRIPT] = _fill_task(redis)
+    rows = iter([_row("old"), _row("new")])
+
+    async def get_task(task_id, db):
+        row = next(rows)
+        if write_during_read:
+            # An update commits and invalidates between read and fill
+            await TaskService._invalidate_cached_tasks(task_id)
+        return row
+
+    monkeypatch.setattr(TaskDAO, "get_task_by_id_or_raise", get_task)
+
+    async def run():
+        first = await TaskService._get_live_task_by_id(1, None)
+        second = await TaskService._get_live_task_by_id(1, None)
+        return first.title, second.title
+
+    return asyncio.run(run())
+
+
+def test_read_through_fill_is_cached(fake_redis, monkeypatch):
+    titles = _read_with_concurrent_write(fake_redis, monkeypatch, False)
+
+    assert titles == ("old", "old")
+    assert task_cache_key(1) in fake_redis.data
+
+
+def test_fill_racing_an_invalidation_is_dropped(fake_redis, monkeypatch):
+    titles = _read_with_concurrent_write(fake_redis, monkeypatch, True)
+
+    # The stale first read was not cached, so the next read hits the DB
+    assert titles == ("old", "new")
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+from config import settings
+from tasks.changes import TASK_CHANGES_STREAM, TaskChangeFeed
+
+
+def _add(redis, op, ids):
+    return redis.append(
+        TASK_CHANGES_STREAM, {"op": op, "ids": json.dumps(ids)}
+    )
+
+
+def _event(op, ids, event_id):
+    data = json.dumps({"ids": ids})
+    return f"id: {event_id}\nevent: {op}\ndata: {data}\n\n"
+
+
+RESET = "event: reset\ndata: {}\n\n"
+
+
+async def _let_listener_start():
+    # The listener starts after the newest entry, so give it a turn to
+    # look that up before publishing
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _run(redis, scenario):
+    async def run():
+        feed = TaskChangeFeed()
+        try:
+            return await scenario(feed, redis)
+        finally:
+            await feed.close()
+
+    return asyncio.run(run())
+
+
+def test_resume_replays_events_after_last_event_id(fake_redis):
+    async def scenario(feed, redis):
+        _add(redis, "created", [1])
+        _add(redis, "updated", [1])
+        _add(redis, "deleted", [2])
+
+        events = feed.subscribe("1-0")
+        replayed = [await events.__anext__(), await events.__anext__()]
+        await _let_listener_start()
+        # A live event already covered by the replay is not sent twice
+        await feed.publish("deleted", [3])
+        subscriber, = feed._subscribers
+        subscriber.queue.put_nowait(("3-0", "deleted", '{"ids": [2]}'))
+        live = await events.__anext__()
+        await events.aclose()
+        return replayed, live
+
+    replayed, live = _run(fake_redis, scenario)
+
+    assert replayed == [
+        _event("updated", [1], "2-0"), _event("deleted", [2], "3-0")
+    ]
+    assert live == _event("deleted", [3], "4-0")
+
+
+def test_resume_past_the_trimmed_stream_sends_reset(fake_redis):
+    async def scenario(feed, redis):
+        for task_id in range(5):
+            _add(redis, "created", [task_id])
+        redis.streams[TASK_CHANGES_STREAM] = (
+            redis.streams[TASK_CHANGES_STREAM][-2:]
+        )
+
+        events = feed.subscribe("2-0")
+        received = [await events.__anext__() for _ in range(3)]
+        await events.aclose()
+        return received
+
+    assert _run(fake_redis, scenario) == [
+        RESET, _event("created", [3], "4-0"), _event("created", [4], "5-0")
+    ]
+
+
+def test_malformed_last_event_id_sends_reset(fake_redis):
+    async def scenario(feed, redis):
+        events = feed.subscribe("not-an-id")
+        first = await events.__anext__()
+        await events.aclose()
+        return first
+
+    assert _run(fake_redis, scenario) == RESET
+
+
+def test_slow_subscriber_gets_reset_after_queue_overflow(
+    fake_redis, monkeypatch
+):
+    monkeypatch.setattr(settings, "task_changes_queue_size", 2)
+
+    async def scenario(feed, redis):
+        events = feed.subscribe()
+        first = asyncio.ensure_future(events.__anext__())
+        await _let_listener_start()
+        for task_id in range(3):
+            await feed.publish("created", [task_id])
+
+        received = [await first]
+        async for event in events:
+            received.append(event)
+        return received, feed._subscribers
+
+    received, subscribers = _run(fake_redis, scenario)
+
+    assert received == [
+        _event("created", [0], "1-0"), _event("created", [1], "2-0"), RESET
+    ]
+    assert not subscribers
+
+
+def test_entries_appended_between_reads_are_not_skipped(
+    fake_redis, monkeypatch
+):
+    xread = fake_redis.xread
+    reads = []
+
+    async def timeout_once(streams, count=None, block=None):
+        reads.append(streams)
+        if len(reads) == 1:
+            # The first read times out empty; an entry lands before the
+            # listener issues the next one
+            _add(fake_redis, "created", [7])
+            return []
+        return await xread(streams, count, block)
+
+    monkeypatch.setattr(fake_redis, "xread", timeout_once)
+    _add(fake_redis, "created", [1])
+
+    async def run():
+        feed = TaskChangeFeed()
+        try:
+            events = feed.subscribe()
+            received = await asyncio.wait_for(events.__anext__(), 1)
+            await events.aclose()
+            return received
+        finally:
+            await feed.close()
+
+    assert asyncio.run(run()) == _event("created", [7], "2-0")
+
+
+def test_entries_appended_during_replay_are_not_skipped(
+    fake_redis, monkeypatch
+):
+    xrange = fake_redis.xrange
+
+    async def append_after_replay(name, min="-", max="+", count=None):
+        entries = await xrange(name, min, max, count)
+        if min.startswith("("):
+            # Lands after the replay read, before any live read
+            _add(fake_redis, "created", [7])
+        return entries
+
+    monkeypatch.setattr(fake_redis, "xrange", append_after_replay)
+    _add(fake_redis, "created", [1])
+    _add(fake_redis, "updated", [1])
+
+    async def run():
+        feed = TaskChangeFeed()
+        try:
+            events = feed.subscribe("1-0")
+            received = [await asyncio.wait_for(events.__anext__(), 1)
+                        for _ in range(2)]
+            await events.aclose()
+            return received
+        finally:
+            await feed.close()
+
+    assert asyncio.run(run()) == [
+        _event("updated", [1], "2-0"), _event("created", [7], "3-0")
+    ]
@@ -0,0 +1,55 @@
+from sqlalchemy import delete, insert, text, update
+
+from tasks.crud import TaskDAO
+from tasks.schema import Task
+
+
+def test_every_committed_write_bumps_the_list_version(run_in_migrated_schema):
+    async def scenario(db):
+        versions = [await TaskDAO.get_tasks_version(db)]
+
+        async def write(statement):
+            await db.execute(statement)
+            await db.commit()
+            versions.append(await TaskDAO.get_tasks_version(db))
+
+        await write(insert(Task).values(title="a"))
+        await write(update(Task).values(completed=True))
+        # Statements that touch no rows leave the version alone
+        await write(update(Task).where(Task.id == -1).values(title="x"))
+        await write(delete(Task))
+
+        await db.execute(insert(Task).values(title="rolled back"))
+        await db.rollback()
+        versions.append(await TaskDAO.get_tasks_version(db))
+        return versions
+
+    assert run_in_migrated_schema(scenario) == [0, 1, 2, 2, 3, 3]
+
+
+def test_list_version_is_bumped_by_raw_sql_writes(
+    migrated_schema, run_in_migrated_schema
+):
+    with migrated_schema.begin() as conn:
+        conn.execute(text("INSERT INTO tasks (title) VALUES ('raw')"))
+
+    assert run_in_migrated_schema(TaskDAO.get_tasks_version) >= 1
+
+
+def test_concurrent_writers_do_not_block_each_other(
+    migrated_schema, run_in_migrated_schema
+):
+    before = run_in_migrated_schema(TaskDAO.get_tasks_version)
+
+    with migrated_schema.connect() as first, \
+            migrated_schema.connect() as second:
+        first_tx = first.begin()
+        first.execute(text("INSERT INTO tasks (title) VALUES ('first')"))
+        # While the first writer holds its counter slot, a second writer
+        # must commit without waiting for it
+        with second.begin():
+            second.execute(text("SET LOCAL lock_timeout = '1s'"))
+            second.execute(text("INSERT INTO tasks (title) VALUES ('second')"))
+        first_tx.commit()
+
+    assert run_in_migrated_schema(TaskDAO.get_tasks_version) == before + 2
@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+import tasks.service
+from tasks.crud import TaskDAO
+from tasks.exceptions import InvalidCursorException
+from tasks.schema import Task
+from tasks.service import TaskService
+from tasks.utils import decode_cursor, encode_cursor
+
+
+def _raw_cursor(text):
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+MALFORMED_CURSORS = [
+    "not base64!",
+    _raw_cursor("no separator"),
+    _raw_cursor("2026-01-01T00:00:00|1|2"),
+    _raw_cursor("yesterday|1"),
+    _raw_cursor("2026-01-01T00:00:00|one"),
+    # Decodable, but not bindable against the tasks columns
+    _raw_cursor("2026-01-01T00:00:00+00:00|1"),
+    _raw_cursor(f"2026-01-01T00:00:00|{2**31}"),
+]
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_cursor(encode_cursor(0.125, 7), parse=float) == (0.125, 7)
+    # Cursors are URL-safe without padding
+    assert "=" not in encode_cursor(created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", MALFORMED_CURSORS)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor)
+
+
+def test_non_finite_rank_cursor_is_rejected():
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(_raw_cursor("nan|1"), parse=float)
+
+
+@pytest.mark.parametrize("path", ["/tasks/", "/tasks/search?q=milk"])
+def test_malformed_cursor_returns_422(monkeypatch, path):
+    import main
+
+    async def version(db):
+        return 0
+
+    monkeypatch.setattr(TaskService, "get_tasks_version", version)
+
+    client = TestClient(main.app)
+    for cursor in MALFORMED_CURSORS:
+        response = client.get(path, params={"cursor": cursor})
+        assert response.status_code == 422, cursor
+
+
+def test_export_pulls_one_batch_per_chunk(monkeypatch):
+    produced = []
+
+    async def stream_tasks(db, fetch_size):
+        for batch in range(3):
+            produced.append(batch)
+            yield [(batch, f"task {batch}", None, False,
+                    datetime(2026, 1, 1), datetime(2026, 1, 1))]
+
+    class _Session:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(TaskDAO, "stream_tasks", stream_tasks)
+    monkeypatch.setattr(tasks.service, "AsyncSessionLocal", _Session)
+
+    async def run():
+        chunks = TaskService.export_tasks("ndjson", 1)
+        first = await chunks.__anext__()
+        # Nothing beyond the first batch is read until the client asks
+        produced_before_next = list(produced)
+        rest = [chunk async for chunk in chunks]
+        return first, produced_before_next, rest
+
+    first, produced_before_next, rest = asyncio.run(run())
+
+    assert json.loads(first)["id"] == 0
+    assert produced_before_next == [0]
+    assert [json.loads(chunk)["id"] for chunk in rest] == [1, 2]
+
+
+def test_stream_tasks_yields_fetch_size_batches_in_cursor_order(
+    run_with_tasks_table
+):
+    async def scenario(db):
+        # Two tasks share a created_at, so id breaks the tie
+        await db.execute(insert(Task), [
+            {"title": "c", "created_at": datetime(2026, 1, 3)},
+            {"title": "a", "created_at": datetime(2026, 1, 1)},
+            {"title": "b1", "created_at": datetime(2026, 1, 2)},
+            {"title": "b2", "created_at": datetime(2026, 1, 2)},
+            {"title": "d", "created_at": datetime(2026, 1, 4)},
+        ])
+        await db.commit()
+        return [
+            [row.title for row in batch]
+            async for batch in TaskDAO.stream_tasks(db, 2)
+        ]
+
+    assert run_with_tasks_table(scenario) == [["a", "b1"], ["b2", "c"], ["d"]]
@@ -0,0 +1,99 @@
+"""
+EXPLAIN every GET /tasks/ filter and order_by combination against the
+schema built by the Alembic migrations and assert that no plan falls back
+to a sequential scan.
+"""
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from tasks.crud import _tasks_page_query
+from tasks.models import TaskFilter
+
+NOW = datetime(2026, 1, 1)
+PAGE_LIMIT = 21  # default page size + 1 look-ahead row
+
+SEED_SQL = """
+    INSERT INTO tasks (title, description, completed, created_at, updated_at)
+    SELECT 'task ' || i, 'description ' || i, i % 3 = 0,
+           :now - make_interval(mins => i * 7),
+           :now - make_interval(mins => i * 3)
+    FROM generate_series(1, 100000) AS i;
+
+    CREATE TABLE tasks_archive_test PARTITION OF tasks_archive
+        FOR VALUES FROM ('2025-01-01') TO ('2027-01-01');
+    INSERT INTO tasks_archive
+        (id, title, description, completed, created_at, updated_at,
+         archived_at)
+    SELECT 1000000 + i, 'archived ' || i, NULL, true,
+           :now - make_interval(days => 400, mins => i * 7),
+           :now - make_interval(days => 400, mins => i * 3),
+           :now - make_interval(days => 1)
+    FROM generate_series(1, 100000) AS i;
+
+    ANALYZE tasks;
+    ANALYZE tasks_archive;
+"""
+
+COMPLETED = (None, True, False)
+CREATED_RANGES = (
+    (None, None),
+    (NOW - timedelta(days=30), None),
+    (None, NOW - timedelta(days=300)),
+    (NOW - timedelta(days=300), NOW - timedelta(days=30)),
+)
+UPDATED_SINCE = (None, NOW - timedelta(days=60))
+ORDER_BY = ("created_at", "-created_at", "updated_at", "-updated_at")
+INCLUDE_ARCHIVED = (False, True)
+CURSORS = (False, True)
+
+
+def _combinations():
+    for (completed, (created_after, created_before), updated_since,
+         order_by, include_archived, with_cursor) in itertools.product(
+            COMPLETED, CREATED_RANGES, UPDATED_SINCE, ORDER_BY,
+            INCLUDE_ARCHIVED, CURSORS):
+        filters = TaskFilter(
+            completed=completed,
+            created_after=created_after,
+            created_before=created_before,
+            updated_since=updated_since,
+            order_by=order_by,
+            include_archived=include_archived
+        )
+        after = (NOW - timedelta(days=10), 5000) if with_cursor else None
+        yield filters, after
+
+
+def _explain(conn, filters, after):
+    query = _tasks_page_query(filters, PAGE_LIMIT, after)
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return "\n".join(conn.execute(text(f"EXPLAIN {sql}")).scalars())
+
+
+@pytest.fixture(scope="module")
+def seeded_schema(migrated_schema):
+    with migrated_schema.begin() as conn:
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                conn.execute(text(statement), {"now": NOW})
+    return migrated_schema
+
+
+def test_every_filter_and_order_combination_uses_an_index(seeded_schema):
+    failures = []
+    with seeded_schema.connect() as conn:
+        for filters, after in _combinations():
+            plan = _explain(conn, filters, after)
+            if "Seq Scan" in plan or "Index" not in plan:
+                failures.append(
+                    f"{filters.model_dump(exclude_defaults=True)} "
+                    f"after={after}:\n{plan}"
+                )
+
+    assert not failures, "\n\n".join(failures)
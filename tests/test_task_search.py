@@ -0,0 +1,55 @@
+"""
+Full-text search and its (rank, id) cursor against a real tasks table;
+skipped without TEST_DATABASE_URL.
+"""
+from sqlalchemy import insert
+
+from tasks.schema import Task
+from tasks.service import TaskService
+
+TASKS = [
+    ("buy milk", "milk milk milk"),
+    ("buy milk", None),
+    ("buy milk", None),
+    ("buy milk", None),
+    ("buy bread", "and butter"),
+    ("call mom", "about the milk"),
+]
+
+
+def _search_all(run_with_tasks_table, query, limit):
+    async def scenario(db):
+        await db.execute(insert(Task), [
+            {"title": title, "description": description}
+            for title, description in TASKS
+        ])
+        await db.commit()
+
+        pages, cursor = [], None
+        while True:
+            rows, cursor = await TaskService.search_tasks(
+                db, query, limit, cursor
+            )
+            pages.append([(row.id, row.rank) for row in rows])
+            if cursor is None:
+                return pages
+
+    return run_with_tasks_table(scenario)
+
+
+def test_search_pages_cover_every_match_once_best_first(run_with_tasks_table):
+    pages = _search_all(run_with_tasks_table, "milk", limit=2)
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    # Tasks 1-4 and 6 mention milk; ties on rank are broken by id, and the
+    # cursor resumes inside a run of equal ranks without skipping any
+    assert sorted(task_id for task_id, _ in rows) == [1, 2, 3, 4, 6]
+    assert rows[0][0] == 1
+    assert rows == sorted(rows, key=lambda row: (row[1], row[0]), reverse=True)
+
+
+def test_search_uses_web_search_syntax(run_with_tasks_table):
+    pages = _search_all(run_with_tasks_table, "buy -milk", limit=10)
+
+    assert [task_id for task_id, _ in pages[0]] == [5]
@@ -0,0 +1,131 @@
+"""
+Redis task counters behind GET /tasks/stats and the reconcile job; needs
+TEST_REDIS_URL (and TEST_DATABASE_URL for the write path).
+"""
+import asyncio
+
+import pytest
+import redis as redis_sync
+import redis.asyncio as redis_async
+from sqlalchemy.orm import sessionmaker
+
+import tasks.background_tasks
+import tasks.changes
+import tasks.service
+from config import settings
+from tasks.background_tasks import reconcile_task_stats
+from tasks.crud import TaskDAO
+from tasks.models import TaskCreate, TaskUpdate
+from tasks.service import TaskService
+from tasks.utils import TASK_STATS_COMPLETED_KEY, TASK_STATS_TOTAL_KEY
+
+STATS_KEYS = (TASK_STATS_TOTAL_KEY, TASK_STATS_COMPLETED_KEY)
+
+
+@pytest.fixture
+def stats_client(redis_url):
+    """A sync client on TEST_REDIS_URL with the counters cleared."""
+    client = redis_sync.Redis.from_url(redis_url)
+    client.delete(*STATS_KEYS)
+    yield client
+    client.delete(*STATS_KEYS)
+    client.close()
+
+
+def _use_redis(monkeypatch, client):
+    for module in (tasks.service, tasks.changes):
+        monkeypatch.setattr(module, "get_redis", lambda: client)
+
+
+def test_counters_are_adjusted_only_once_seeded(
+    redis_url, stats_client, monkeypatch
+):
+    async def run():
+        client = redis_async.from_url(redis_url)
+        _use_redis(monkeypatch, client)
+        try:
+            await TaskService._adjust_stats(total=1, completed=1)
+            unseeded = await client.mget(*STATS_KEYS)
+            await client.set(TASK_STATS_TOTAL_KEY, 10)
+            await TaskService._adjust_stats(total=1, completed=1)
+            half_seeded = await client.mget(*STATS_KEYS)
+            await client.set(TASK_STATS_COMPLETED_KEY, 4)
+            await TaskService._adjust_stats(total=-1, completed=1)
+            seeded = await client.mget(*STATS_KEYS)
+        finally:
+            await client.aclose()
+        return unseeded, half_seeded, seeded
+
+    # Missing counters are left for the next read to rebuild from Postgres
+    assert asyncio.run(run()) == (
+        [None, None], [b"10", None], [b"9", b"5"]
+    )
+
+
+def test_seeding_never_overwrites_stored_counters(
+    redis_url, stats_client, monkeypatch
+):
+    async def counts(db):
+        # A stale count, e.g. taken before a concurrent reader's seed
+        return 3, 1
+
+    monkeypatch.setattr(TaskDAO, "get_task_counts", counts)
+    # Another reader already seeded (and writes adjusted) total
+    stats_client.set(TASK_STATS_TOTAL_KEY, 10)
+
+    async def run():
+        client = redis_async.from_url(redis_url)
+        _use_redis(monkeypatch, client)
+        try:
+            return await TaskService.get_task_stats(None)
+        finally:
+            await client.aclose()
+
+    stats = asyncio.run(run())
+
+    assert (stats.total, stats.completed) == (10, 1)
+    assert stats_client.mget(*STATS_KEYS) == [b"10", b"1"]
+
+
+def test_writes_adjust_counters_and_reconcile_repairs_drift(
+    migrated_schema, run_in_migrated_schema, redis_url, stats_client,
+    monkeypatch
+):
+    async def scenario(db):
+        client = redis_async.from_url(redis_url)
+        _use_redis(monkeypatch, client)
+        try:
+            # The first read seeds the counters from Postgres
+            stats = [await TaskService.get_task_stats(db)]
+            task = await TaskService.create_task(TaskCreate(title="a"), db)
+            stats.append(await TaskService.get_task_stats(db))
+            await TaskService.update_task(
+                task.id, TaskUpdate(completed=True), db
+            )
+            stats.append(await TaskService.get_task_stats(db))
+            await TaskService.create_task(
+                TaskCreate(title="b", completed=True), db
+            )
+            stats.append(await TaskService.get_task_stats(db))
+            await TaskService.delete_task(task.id, db)
+            stats.append(await TaskService.get_task_stats(db))
+        finally:
+            await client.aclose()
+        return [(s.total, s.completed, s.pending) for s in stats]
+
+    assert run_in_migrated_schema(scenario) == [
+        (0, 0, 0), (1, 0, 1), (1, 1, 0), (2, 2, 0), (1, 1, 0)
+    ]
+
+    # Drift, e.g. from increments lost while Redis was unreachable
+    stats_client.mset({
+        TASK_STATS_TOTAL_KEY: 100, TASK_STATS_COMPLETED_KEY: -3
+    })
+    monkeypatch.setattr(
+        tasks.background_tasks, "SyncSessionLocal",
+        sessionmaker(bind=migrated_schema)
+    )
+    monkeypatch.setattr(settings, "redis_url", redis_url)
+
+    assert reconcile_task_stats() == {"total": 1, "completed": 1}
+    assert stats_client.mget(*STATS_KEYS) == [b"1", b"1"]
@@ -0,0 +1,96 @@
+"""
+Single-task writes (UPDATE/DELETE ... RETURNING) against a real tasks
+table; skipped without TEST_DATABASE_URL.
+"""
+import pytest
+from sqlalchemy import insert
+
+from tasks.crud import TaskDAO
+from tasks.exceptions import TaskNotFoundException
+from tasks.models import TaskUpdate
+from tasks.schema import Task
+from tasks.service import _ADJUST_STATS_SCRIPT, TaskService
+
+
+def _stats_deltas(redis):
+    """The stats deltas TaskService applied after each write."""
+    return [tuple(args) for script, keys, args in redis.evals
+            if script == _ADJUST_STATS_SCRIPT]
+
+
+async def _add_task(db, **values):
+    # Core INSERT, so the session holds no Task to hand back unrefreshed
+    task_id = await db.scalar(
+        insert(Task).values(title="task", **values).returning(Task.id)
+    )
+    await db.commit()
+    return task_id
+
+
+def test_missing_task_raises_not_found(run_with_tasks_table, fake_redis):
+    async def scenario(db):
+        raised = []
+        for write in (
+            TaskService.update_task(-1, TaskUpdate(completed=True), db),
+            TaskService.delete_task(-1, db),
+        ):
+            try:
+                await write
+            except TaskNotFoundException as e:
+                raised.append(e.task_id)
+        return raised
+
+    assert run_with_tasks_table(scenario) == [-1, -1]
+    assert _stats_deltas(fake_redis) == []
+
+
+def test_empty_update_returns_the_stored_task(
+    run_with_tasks_table, fake_redis, monkeypatch
+):
+    async def no_update(task_id, values, db):
+        raise AssertionError("an empty update must not write")
+
+    monkeypatch.setattr(TaskDAO, "update_task", no_update)
+
+    async def scenario(db):
+        task_id = await _add_task(db, completed=True)
+        task = await TaskService.update_task(task_id, TaskUpdate(), db)
+        with pytest.raises(TaskNotFoundException):
+            await TaskService.update_task(-1, TaskUpdate(), db)
+        return task.id == task_id, task.title, task.completed
+
+    assert run_with_tasks_table(scenario) == (True, "task", True)
+    assert _stats_deltas(fake_redis) == []
+
+
+def test_update_returns_previous_completed(run_with_tasks_table):
+    async def scenario(db):
+        task_id = await _add_task(db, completed=False)
+        results = []
+        for completed in (True, True, False):
+            task, previous = await TaskDAO.update_task(
+                task_id, {"completed": completed}, db
+            )
+            results.append((task.completed, previous))
+            db.expunge_all()
+        return results
+
+    assert run_with_tasks_table(scenario) == [
+        (True, False), (True, True), (False, True)
+    ]
+
+
+def test_writes_adjust_stats_by_the_previous_state(
+    run_with_tasks_table, fake_redis
+):
+    async def scenario(db):
+        task_id = await _add_task(db, completed=False)
+        await TaskService.update_task(task_id, TaskUpdate(completed=True), db)
+        await TaskService.update_task(task_id, TaskUpdate(title="same"), db)
+        await TaskService.delete_task(task_id, db)
+
+    run_with_tasks_table(scenario)
+
+    # Completing counts once, a rename changes nothing (and is skipped),
+    # and deleting a completed task removes it from both counters
+    assert _stats_deltas(fake_redis) == [(0, 1), (-1, -1)]
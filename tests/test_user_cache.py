@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import auth.service
+from auth.crud import UserDAO
+from auth.models import User
+from auth.service import AuthService
+from auth.user_cache import UserCache
+from config import settings
+
+# Every simulated worker's cache shares one in-memory Redis
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def _user(user_id):
+    return User(id=user_id, email=f"user{user_id}@example.com")
+
+
+def _run(scenario, workers=1):
+    """Run `scenario(*caches)` with one UserCache per simulated worker."""
+    async def run():
+        caches = [UserCache() for _ in range(workers)]
+        try:
+            return await scenario(*caches)
+        finally:
+            for cache in caches:
+                await cache.close()
+
+    return asyncio.run(run())
+
+
+async def _let_listeners_subscribe():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_least_recently_used_user_is_evicted(monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_max_size", 2)
+
+    async def scenario(cache):
+        for user_id in (1, 2):
+            cache.set(_user(user_id))
+        cache.get("user1@example.com")
+        cache.set(_user(3))
+        return [cache.get(f"user{user_id}@example.com") is not None
+                for user_id in (1, 2, 3)]
+
+    assert _run(scenario) == [True, False, True]
+
+
+def test_cached_user_expires_after_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_ttl_seconds", 0.05)
+
+    async def scenario(cache):
+        cache.set(_user(1))
+        fresh = cache.get("user1@example.com")
+        await asyncio.sleep(0.1)
+        return fresh, cache.get("user1@example.com")
+
+    fresh, expired = _run(scenario)
+
+    assert fresh == _user(1)
+    assert expired is None
+
+
+@pytest.mark.parametrize("change", ["password", "delete"])
+def test_account_changes_evict_the_user_in_every_worker(monkeypatch, change):
+    db_user = SimpleNamespace(
+        id=1, email="user1@example.com", hashed_password="old"
+    )
+
+    async def get_user(user_id, db):
+        return db_user
+
+    async def write_user(user, db):
+        return True
+
+    async def hash_password(password):
+        return "new"
+
+    async def revoke(email):
+        pass
+
+    monkeypatch.setattr(UserDAO, "get_user_by_id_or_raise", get_user)
+    monkeypatch.setattr(UserDAO, "update_user", write_user)
+    monkeypatch.setattr(UserDAO, "delete_user", write_user)
+    monkeypatch.setattr(auth.service, "get_password_hash_async", hash_password)
+    monkeypatch.setattr(
+        AuthService, "revoke_refresh_tokens", staticmethod(revoke)
+    )
+
+    async def scenario(this_worker, other_worker):
+        monkeypatch.setattr(auth.service, "user_cache", this_worker)
+        for cache in (this_worker, other_worker):
+            cache.set(_user(1))
+            cache.get(db_user.email)
+        await _let_listeners_subscribe()
+
+        if change == "password":
+            await AuthService.update_user_password(1, "new password", None)
+        else:
+            await AuthService.delete_user_account(1, None)
+        await _let_listeners_subscribe()
+
+        return this_worker.get(db_user.email), other_worker.get(db_user.email)
+
+    assert _run(scenario, workers=2) == (None, None)